@@ -1,33 +1,84 @@
 """
 Extract audio from video files using FFmpeg.
 """
+import functools
+import json
+import os
+import shutil
 import subprocess
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Only needed for in-memory extraction
 
+# Cache of ffprobe results keyed by (path, mtime) so repeated extractions
+# (e.g. from process_channel) don't re-probe unchanged files
+_probe_cache: Dict[tuple, Optional[Dict]] = {}
+
+
+@functools.lru_cache(maxsize=None)
 def check_ffmpeg_installed() -> bool:
-    """Check if FFmpeg is installed and available."""
+    """Check if FFmpeg is installed and available (cached per interpreter)."""
+    # A PATH walk costs microseconds; spawning `ffmpeg -version` costs ~100ms
+    return shutil.which("ffmpeg") is not None
+
+
+def probe_audio(video_path: str) -> Optional[Dict]:
+    """
+    Probe the first audio stream of a video file using ffprobe.
+
+    Args:
+        video_path: Path to video file
+
+    Returns:
+        Dictionary with codec_name, sample_rate and channels for the first
+        audio stream, or None if probing fails or there is no audio stream
+    """
     try:
-        subprocess.run(
-            ["ffmpeg", "-version"],
+        cache_key = (str(video_path), Path(video_path).stat().st_mtime)
+    except OSError:
+        return None
+
+    if cache_key in _probe_cache:
+        return _probe_cache[cache_key]
+
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v", "error",
+                "-select_streams", "a:0",
+                "-show_entries", "stream=codec_name,sample_rate,channels",
+                "-of", "json",
+                str(video_path)
+            ],
             capture_output=True,
+            text=True,
             check=True
         )
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+        streams = json.loads(result.stdout).get("streams", [])
+        stream = streams[0] if streams else None
+    except (subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError):
+        stream = None
 
+    _probe_cache[cache_key] = stream
+    return stream
 
-def extract_audio(video_path: str, output_path: Optional[str] = None) -> str:
+
+def extract_audio(video_path: str, output_path: Optional[str] = None, threads: int = 1) -> str:
     """
     Extract audio from a video file and save as WAV.
-    
+
     Args:
         video_path: Path to input video file (.mp4, .avi, etc.)
         output_path: Optional path to output audio file (.wav).
                     If not provided, uses video_path with .wav extension.
-        
+        threads: FFmpeg thread budget. Keep at 1 when many extractions run in
+                parallel so the children don't oversubscribe the cores.
+
     Returns:
         Path to extracted audio file
         
@@ -42,56 +93,100 @@ def extract_audio(video_path: str, output_path: Optional[str] = None) -> str:
             "FFmpeg is not installed. Install it from https://ffmpeg.org/"
         )
     
-    # Validate input file exists
-    video_file = Path(video_path)
-    if not video_file.exists():
+    # Validate and normalize the input path in one step: resolve(strict=True)
+    # stats the file once and raises if it doesn't exist
+    try:
+        video_file = Path(video_path).resolve(strict=True)
+    except FileNotFoundError:
         raise FileNotFoundError(f"Video file not found: {video_path}")
     
-    # Determine output path
+    # Determine output path (one Path object, one str coercion)
     if output_path is None:
-        output_path = str(video_file.with_suffix('.wav'))
+        output_file = video_file.with_suffix('.wav')
     else:
-        output_path = str(Path(output_path))
-    
+        output_file = Path(output_path)
+    output_path = str(output_file)
+
+    # Fast path: a previous extraction is still valid (non-empty and newer
+    # than the source video), so skip the ffmpeg spawn entirely
+    try:
+        out_stat = os.stat(output_path)
+        if out_stat.st_size > 0 and out_stat.st_mtime >= video_file.stat().st_mtime:
+            return output_path
+    except OSError:
+        pass
+
     # Create output directory if it doesn't exist
-    output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    
+
+    # Fast path: if the source audio is already 16kHz mono PCM, just remux it
+    # with -c:a copy and skip the whole decode/resample/re-encode pipeline
+    stream = probe_audio(str(video_file))
+    already_compatible = (
+        stream is not None
+        and stream.get("codec_name") == "pcm_s16le"
+        and stream.get("sample_rate") == "16000"
+        and stream.get("channels") == 1
+    )
+
     # FFmpeg command to extract audio:
+    # -hide_banner/-loglevel error/-nostats: only emit actual errors (avoids
+    #   buffering megabytes of progress logs in the subprocess pipe)
+    # -probesize/-analyzeduration/-fflags +nobuffer: bound libavformat's
+    #   initial stream analysis (default ~5s probe is pure waste for
+    #   audio-only extraction from MP4)
     # -i: input file
     # -vn: disable video (no video output)
     # -acodec pcm_s16le: PCM 16-bit little-endian audio codec
     # -ar 16000: sample rate 16000 Hz (optimal for Whisper)
     # -ac 1: mono audio (1 channel)
+    # -threads/-filter_threads: bound per-process parallelism (see `threads`)
     # -y: overwrite output file if it exists
     cmd = [
         "ffmpeg",
-        "-i", str(video_path),
+        "-hide_banner",
+        "-loglevel", "error",
+        "-nostats",
+        "-filter_threads", str(threads),
+        "-probesize", "32k",
+        "-analyzeduration", "0",
+        "-fflags", "+nobuffer",
+        "-i", str(video_file),
         "-vn",  # No video
-        "-acodec", "pcm_s16le",  # PCM 16-bit
-        "-ar", "16000",  # 16kHz sample rate
-        "-ac", "1",  # Mono
-        "-y",  # Overwrite output
-        str(output_path)
     ]
+    if already_compatible:
+        cmd.extend(["-c:a", "copy"])  # Demux only, no re-encode
+    else:
+        cmd.extend([
+            "-acodec", "pcm_s16le",  # PCM 16-bit
+            "-ar", "16000",  # 16kHz sample rate
+            "-ac", "1",  # Mono
+        ])
+    cmd.extend([
+        "-threads", str(threads),
+        "-y",  # Overwrite output
+        output_path
+    ])
     
     try:
+        # Discard stdout entirely; with -loglevel error stderr only carries the
+        # short final error message, so there is no pipe backpressure to stall on
         result = subprocess.run(
             cmd,
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True,
             check=True
         )
-        
-        # Verify output file was created
-        if not Path(output_path).exists():
+
+        # Verify output file was created and is non-empty (one stat syscall)
+        try:
+            file_size = os.stat(output_path).st_size
+        except FileNotFoundError:
             raise RuntimeError(f"Audio file was not created: {output_path}")
-        
-        # Check file size (should be > 0)
-        file_size = Path(output_path).stat().st_size
         if file_size == 0:
             raise ValueError("Extracted audio file is empty - video may have no audio track")
-        
+
         return output_path
         
     except subprocess.CalledProcessError as e:
@@ -106,6 +201,151 @@ def extract_audio(video_path: str, output_path: Optional[str] = None) -> str:
             raise RuntimeError(f"FFmpeg extraction failed: {error_msg}")
 
 
+def extract_audio_to_ndarray(video_path: str, threads: int = 1) -> "np.ndarray":
+    """
+    Decode a video's audio straight into a float32 numpy array.
+
+    Pipes ffmpeg's raw PCM output through stdout instead of writing a .wav
+    and reading it back, which removes a full write+read of uncompressed
+    16 kHz audio per video. The array is in the format Whisper expects
+    (float32 mono, 16 kHz, normalized to [-1, 1]).
+
+    Args:
+        video_path: Path to input video file
+        threads: FFmpeg thread budget (see extract_audio)
+
+    Returns:
+        1-D float32 numpy array of audio samples
+
+    Raises:
+        ImportError: If numpy is not installed
+        FileNotFoundError: If video file doesn't exist or FFmpeg not installed
+        ValueError: If video file has no audio track
+        RuntimeError: If FFmpeg extraction fails
+    """
+    if np is None:
+        raise ImportError(
+            "numpy is required for in-memory audio extraction. Install it with: pip install numpy"
+        )
+
+    if not check_ffmpeg_installed():
+        raise FileNotFoundError(
+            "FFmpeg is not installed. Install it from https://ffmpeg.org/"
+        )
+
+    try:
+        video_file = Path(video_path).resolve(strict=True)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Video file not found: {video_path}")
+
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel", "error",
+        "-nostats",
+        "-probesize", "32k",
+        "-analyzeduration", "0",
+        "-i", str(video_file),
+        "-vn",
+        "-f", "s16le",  # Raw PCM to stdout, no container
+        "-acodec", "pcm_s16le",
+        "-ar", "16000",
+        "-ac", "1",
+        "-threads", str(threads),
+        "-"
+    ]
+
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        bufsize=1 << 20
+    )
+    raw, err = proc.communicate()
+
+    if proc.returncode != 0:
+        error_msg = err.decode(errors="replace") or "Unknown error"
+        if "does not contain any stream" in error_msg or "No audio stream" in error_msg:
+            raise ValueError(f"Video file has no audio track: {video_path}")
+        elif "Invalid data found" in error_msg:
+            raise ValueError(f"Invalid video format: {video_path}")
+        else:
+            raise RuntimeError(f"FFmpeg extraction failed: {error_msg}")
+
+    if not raw:
+        raise ValueError("Extracted audio is empty - video may have no audio track")
+
+    return np.frombuffer(raw, np.int16).astype(np.float32) / 32768.0
+
+
+def extract_audio_batch(pairs: List[Tuple[str, str]]) -> List[str]:
+    """
+    Extract audio from multiple videos with a single FFmpeg invocation.
+
+    Spawning one ffmpeg per video costs a few hundred ms of process startup
+    and stream analysis each time; for channels of many short clips a single
+    multi-input invocation amortizes that across the whole batch.
+
+    Args:
+        pairs: List of (video_path, output_path) tuples
+
+    Returns:
+        List of output audio file paths (same order as input pairs)
+
+    Raises:
+        FileNotFoundError: If FFmpeg is not installed or a video file is missing
+        RuntimeError: If FFmpeg extraction fails
+    """
+    if not pairs:
+        return []
+
+    # Check if FFmpeg is installed
+    if not check_ffmpeg_installed():
+        raise FileNotFoundError(
+            "FFmpeg is not installed. Install it from https://ffmpeg.org/"
+        )
+
+    # Validate inputs and create output directories up front
+    for video_path, output_path in pairs:
+        if not Path(video_path).exists():
+            raise FileNotFoundError(f"Video file not found: {video_path}")
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    # One ffmpeg process: N inputs, each mapped to its own mono 16kHz WAV output
+    cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-nostats"]
+    for video_path, _ in pairs:
+        cmd.extend(["-probesize", "32k", "-analyzeduration", "0", "-i", str(video_path)])
+    for i, (_, output_path) in enumerate(pairs):
+        cmd.extend([
+            "-map", f"{i}:a:0",
+            "-vn",
+            "-acodec", "pcm_s16le",
+            "-ar", "16000",
+            "-ac", "1",
+            "-y",
+            str(output_path)
+        ])
+
+    try:
+        subprocess.run(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True
+        )
+    except subprocess.CalledProcessError as e:
+        error_msg = e.stderr or "Unknown error"
+        raise RuntimeError(f"FFmpeg batch extraction failed: {error_msg}")
+
+    # Verify all outputs were created
+    for _, output_path in pairs:
+        if not Path(output_path).exists():
+            raise RuntimeError(f"Audio file was not created: {output_path}")
+
+    return [output_path for _, output_path in pairs]
+
+
 if __name__ == "__main__":
     # TODO: Add main execution logic
     pass
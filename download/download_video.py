@@ -1,27 +1,96 @@
 """
 Download videos from TikTok and YouTube.
 """
+import asyncio
+import functools
+import importlib.util
+import os
+import shutil
 import subprocess
 import sys
+import tempfile
+from collections import deque
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple, Union
 import re
 
+try:
+    from yt_dlp import YoutubeDL
+except ImportError:
+    YoutubeDL = None  # Fall back to the yt-dlp CLI
+
+
+# Use format that doesn't require ffmpeg merging
+# Prefer single file format, fallback to best available
+_YDL_OPTS = {
+    "format": "best[ext=mp4]/best[height<=720]/best",
+    "noplaylist": True,
+    "quiet": True,
+    "no_warnings": True,
+}
+
+
+# URL-shape patterns compiled once at module load (these run on every URL in
+# hot scrape/skip loops)
+_YT_RE = re.compile(r'youtube\.com|youtu\.be')
+_TT_RE = re.compile(r'tiktok\.com')
+_YT_ID_RE = re.compile(r'(?:v=|/)([0-9A-Za-z_-]{11})')
+_TT_ID_RE = re.compile(r'/video/(\d+)')
+
+# yt-dlp progress lines look like: [download]  42.3% of 10.00MiB at ...
+_DL_PROGRESS_RE = re.compile(r'\[download\]\s+(\d+\.\d+)%')
+
+
+@functools.lru_cache(maxsize=1)
+def _which_ytdlp() -> Optional[Tuple[str, ...]]:
+    """
+    Find the yt-dlp command vector, probing once per interpreter.
+
+    Uses a PATH walk / import-spec lookup instead of spawning yt-dlp just to
+    detect its presence.
+
+    Returns:
+        Command tuple (e.g. ("yt-dlp",) or ("python3", "-m", "yt_dlp")),
+        or None if yt-dlp is not installed
+    """
+    if shutil.which("yt-dlp"):
+        return ("yt-dlp",)
+    if importlib.util.find_spec("yt_dlp") is not None:
+        return ("python3", "-m", "yt_dlp")
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def get_ydl(cachedir: Optional[str] = None) -> "YoutubeDL":
+    """
+    Shared YoutubeDL instance, created once per (cachedir) per interpreter.
+
+    Reusing one instance keeps the info-extractor caches (signature
+    decryption, nsig JS, player JSON) and the HTTPS connection pool warm
+    across all URLs in a batch instead of rebuilding them per call.
+    Note: YoutubeDL is not thread-safe; concurrent downloaders should use
+    their own instances.
+
+    Args:
+        cachedir: Optional yt-dlp cache directory override
+
+    Returns:
+        Shared YoutubeDL configured with the module's download options
+    """
+    opts = dict(_YDL_OPTS)
+    if cachedir is not None:
+        opts["cachedir"] = cachedir
+    return YoutubeDL(opts)
+
 
 def is_tiktok_url(url: str) -> bool:
     """Check if URL is a TikTok URL."""
-    return "tiktok.com" in url.lower()
+    return bool(_TT_RE.search(url.lower()))
 
 
 def is_youtube_url(url: str) -> bool:
     """Check if URL is a YouTube URL."""
-    youtube_patterns = [
-        r'youtube\.com',
-        r'youtu\.be',
-        r'youtube\.com/watch',
-        r'youtube\.com/shorts'
-    ]
-    return any(re.search(pattern, url.lower()) for pattern in youtube_patterns)
+    return bool(_YT_RE.search(url.lower()))
 
 
 def validate_url(url: str) -> bool:
@@ -29,14 +98,39 @@ def validate_url(url: str) -> bool:
     return is_tiktok_url(url) or is_youtube_url(url)
 
 
-def download_video(url: str, output_path: Optional[str] = None) -> str:
+def _default_output_path(url: str, output_dir: str = "downloads") -> str:
+    """
+    Default {output_dir}/{video_id}.mp4 path for a URL.
+
+    Shared by single and batch downloads so a prefetch pass writes to the
+    exact path a later download_video call (e.g. the pipeline's
+    {videos_dir}/{video_id}.mp4) will find in its cache check.
+    """
+    if is_tiktok_url(url):
+        # TikTok URL format: https://www.tiktok.com/@username/video/1234567890
+        match = _TT_ID_RE.search(url)
+        video_id = match.group(1) if match else "tiktok_video"
+    elif is_youtube_url(url):
+        # YouTube URL format: https://www.youtube.com/watch?v=VIDEO_ID
+        match = _YT_ID_RE.search(url)
+        video_id = match.group(1) if match else "youtube_video"
+    else:
+        video_id = "video"
+    return os.path.join(output_dir, f"{video_id}.mp4")
+
+
+def download_video(url: str, output_path: Optional[str] = None, force_redownload: bool = False, ydl: Optional["YoutubeDL"] = None) -> str:
     """
     Download video from TikTok or YouTube URL.
-    
+
     Args:
         url: TikTok or YouTube video URL
         output_path: Optional output path. If not provided, uses video ID as filename.
-        
+        force_redownload: Re-download even if the output file already exists.
+        ydl: Optional caller-managed YoutubeDL (e.g. from get_ydl()) whose
+            caches are reused across a serial batch. Must not be shared
+            between concurrent downloads.
+
     Returns:
         Path to downloaded video file
         
@@ -48,142 +142,244 @@ def download_video(url: str, output_path: Optional[str] = None) -> str:
     if not validate_url(url):
         raise ValueError(f"Unsupported URL: {url}. Must be from TikTok or YouTube.")
     
-    # Check if yt-dlp is installed (try both yt-dlp and python3 -m yt_dlp)
+    # Check if the yt-dlp CLI is installed (probe runs once per interpreter);
+    # not needed when the yt_dlp library is importable
     yt_dlp_cmd = None
-    try:
-        subprocess.run(
-            ["yt-dlp", "--version"],
-            capture_output=True,
-            check=True
-        )
-        yt_dlp_cmd = "yt-dlp"
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        try:
-            subprocess.run(
-                ["python3", "-m", "yt_dlp", "--version"],
-                capture_output=True,
-                check=True
-            )
-            yt_dlp_cmd = ["python3", "-m", "yt_dlp"]
-        except (subprocess.CalledProcessError, FileNotFoundError):
+    if YoutubeDL is None:
+        yt_dlp_cmd = _which_ytdlp()
+        if yt_dlp_cmd is None:
             raise FileNotFoundError(
                 "yt-dlp is not installed. Install it with: pip install yt-dlp"
             )
     
     # Determine output path
     if output_path is None:
-        # Extract video ID for filename
-        if is_tiktok_url(url):
-            # TikTok URL format: https://www.tiktok.com/@username/video/1234567890
-            match = re.search(r'/video/(\d+)', url)
-            video_id = match.group(1) if match else "tiktok_video"
-            output_path = f"downloads/{video_id}.mp4"
-        elif is_youtube_url(url):
-            # YouTube URL format: https://www.youtube.com/watch?v=VIDEO_ID
-            match = re.search(r'(?:v=|\/)([0-9A-Za-z_-]{11}).*', url)
-            video_id = match.group(1) if match else "youtube_video"
-            output_path = f"downloads/{video_id}.mp4"
-        else:
-            output_path = "downloads/video.mp4"
-    
+        output_path = _default_output_path(url)
+
+    # Fast path: the video is already cached from a previous run, so skip
+    # the yt-dlp spawn and network roundtrip entirely
+    if not force_redownload:
+        try:
+            if os.stat(output_path).st_size > 0:
+                return str(output_path)
+        except OSError:
+            pass
+
     # Create output directory if it doesn't exist
     output_dir = Path(output_path).parent
     output_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Download video using yt-dlp
+
+    # Download video using the yt_dlp library when available: no interpreter
+    # startup per video, and metadata caches survive across calls
+    if YoutubeDL is not None:
+        try:
+            if ydl is not None:
+                # Reuse the caller's instance: its extractor caches survive
+                # across the batch; only the output template changes per URL
+                ydl.params["outtmpl"] = {"default": str(output_path)}
+                ydl.extract_info(url, download=True)
+            else:
+                opts = dict(_YDL_OPTS)
+                opts["outtmpl"] = str(output_path)
+                with YoutubeDL(opts) as one_shot:
+                    one_shot.extract_info(url, download=True)
+        except Exception as e:
+            raise RuntimeError(f"Failed to download video: {e}")
+        return _resolve_downloaded_path(output_path, output_dir)
+
+    # Download video using the yt-dlp CLI (yt_dlp_cmd was resolved by the
+    # probe above; if it were missing we would have raised already)
     # -f: best video format
     # -o: output path
     # --no-playlist: download only single video, not playlist
-    if yt_dlp_cmd is None:
-        # Re-check if not already determined
-        try:
-            subprocess.run(["yt-dlp", "--version"], capture_output=True, check=True)
-            yt_dlp_cmd = "yt-dlp"
-        except:
-            try:
-                subprocess.run(["python3", "-m", "yt_dlp", "--version"], capture_output=True, check=True)
-                yt_dlp_cmd = ["python3", "-m", "yt_dlp"]
-            except:
-                raise FileNotFoundError("yt-dlp is not installed")
-    
     # Use format that doesn't require ffmpeg merging
     # Prefer single file format, fallback to best available
-    if isinstance(yt_dlp_cmd, str):
-        cmd = [
-            yt_dlp_cmd,
-            "-f", "best[ext=mp4]/best[height<=720]/best",  # Single file, no merging needed
-            "-o", str(output_path),
-            "--no-playlist",
-            "--no-warnings",  # Suppress warnings
-            url
-        ]
-    else:
-        cmd = yt_dlp_cmd + [
-            "-f", "best[ext=mp4]/best[height<=720]/best",  # Single file, no merging needed
-            "-o", str(output_path),
-            "--no-playlist",
-            "--no-warnings",  # Suppress warnings
-            url
-        ]
-    
+    cmd = list(yt_dlp_cmd) + [
+        "-f", "best[ext=mp4]/best[height<=720]/best",  # Single file, no merging needed
+        "-o", str(output_path),
+        "--no-playlist",
+        "--no-warnings",  # Suppress warnings
+        url
+    ]
+
     try:
-        result = subprocess.run(
+        # Stream yt-dlp output line-by-line instead of buffering the whole
+        # progress log in memory; keep only a short tail for error reporting
+        process = subprocess.Popen(
             cmd,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            check=True
+            bufsize=1
         )
-        
-        # yt-dlp might add extension, so check if file exists
-        downloaded_path = Path(output_path)
-        if not downloaded_path.exists():
-            # Try with .mp4 extension if not already there
-            if not output_path.endswith('.mp4'):
-                downloaded_path = Path(output_path + '.mp4')
-            # If still not found, look for any file in the directory
-            if not downloaded_path.exists():
-                files = list(output_dir.glob("*"))
-                if files:
-                    downloaded_path = files[0]
-        
-        if not downloaded_path.exists():
-            raise FileNotFoundError(f"Downloaded video not found at {output_path}")
-        
-        return str(downloaded_path)
-        
+        output_tail = deque(maxlen=32)
+        last_percent = None
+        for line in process.stdout:
+            output_tail.append(line)
+            match = _DL_PROGRESS_RE.search(line)
+            if match and match.group(1) != last_percent:
+                last_percent = match.group(1)
+                print(f"\r   Downloading: {last_percent}%", end="", flush=True)
+        process.wait()
+        if last_percent is not None:
+            print()
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(
+                process.returncode, cmd, output="".join(output_tail)
+            )
+
+        return _resolve_downloaded_path(output_path, output_dir)
+
     except subprocess.CalledProcessError as e:
         error_msg = e.stderr or e.stdout or "Unknown error"
         raise RuntimeError(f"Failed to download video: {error_msg}")
 
 
-def get_video_info(url: str) -> dict:
+def _resolve_downloaded_path(output_path: str, output_dir: Path) -> str:
+    """Locate the downloaded file (yt-dlp might add an extension)."""
+    # Try the expected path, then with .mp4 appended (one stat each)
+    candidates = [output_path]
+    if not output_path.endswith('.mp4'):
+        candidates.append(output_path + '.mp4')
+    for candidate in candidates:
+        try:
+            os.stat(candidate)
+            return candidate
+        except OSError:
+            continue
+
+    # If still not found, look for any file in the directory
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            return entry.path
+
+    raise FileNotFoundError(f"Downloaded video not found at {output_path}")
+
+
+async def _download_all(urls: List[str], concurrency: int = 4, output_dir: Optional[str] = None) -> List[Union[str, BaseException]]:
+    """Download many videos concurrently, gated by a semaphore."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(url: str) -> str:
+        async with semaphore:
+            output_path = _default_output_path(url, output_dir) if output_dir else None
+            return await asyncio.to_thread(download_video, url, output_path)
+
+    return await asyncio.gather(*(one(url) for url in urls), return_exceptions=True)
+
+
+def download_videos(urls: List[str], concurrency: int = 4, output_dir: Optional[str] = None) -> List[Union[str, BaseException]]:
+    """
+    Download multiple videos concurrently.
+
+    Downloads are network-bound, so a small amount of concurrency (4-8)
+    saturates a typical link while individual videos still download serially
+    inside yt-dlp.
+
+    Args:
+        urls: Video URLs to download
+        concurrency: Maximum number of simultaneous downloads
+        output_dir: Directory to save videos as {video_id}.mp4. Prefetch
+                   callers must pass the directory the pipeline will later
+                   download into, so its cache check hits these files
+                   (default: downloads/)
+
+    Returns:
+        List with one entry per URL, in order: the downloaded file path on
+        success, or the exception raised for that URL
+    """
+    return asyncio.run(_download_all(urls, concurrency, output_dir))
+
+
+def download_videos_batch(urls: List[str], output_dir: str = "downloads") -> List[str]:
+    """
+    Download many videos with a single yt-dlp process using its batch mode.
+
+    One `yt-dlp -a urls.txt` run shares the Python startup cost and HTTP
+    session (TLS handshakes, cookies) across all URLs instead of paying them
+    once per video.
+
+    Args:
+        urls: Video URLs to download
+        output_dir: Directory to save videos as {video_id}.{ext}
+
+    Returns:
+        List of downloaded file paths (order follows yt-dlp's output)
+
+    Raises:
+        FileNotFoundError: If yt-dlp is not installed
+        RuntimeError: If the batch download produces nothing
+    """
+    if not urls:
+        return []
+
+    yt_dlp_cmd = _which_ytdlp()
+    if yt_dlp_cmd is None:
+        raise FileNotFoundError(
+            "yt-dlp is not installed. Install it with: pip install yt-dlp"
+        )
+
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    # Write the URL list to a tempfile for yt-dlp's -a batch mode
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write("\n".join(urls))
+        batch_file = f.name
+
+    try:
+        cmd = list(yt_dlp_cmd) + [
+            "-a", batch_file,
+            "-f", "best[ext=mp4]/best[height<=720]/best",
+            "-o", os.path.join(output_dir, "%(id)s.%(ext)s"),
+            "--no-playlist",
+            "--no-warnings",
+            "--print", "after_move:filepath",
+            "--no-simulate",
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        paths = [line.strip() for line in result.stdout.splitlines() if line.strip()]
+
+        if result.returncode != 0 and not paths:
+            error_msg = result.stderr or "Unknown error"
+            raise RuntimeError(f"Batch download failed: {error_msg}")
+
+        return paths
+    finally:
+        os.unlink(batch_file)
+
+
+def get_video_info(url: str, ydl: Optional["YoutubeDL"] = None) -> dict:
     """
     Get video information without downloading.
-    
+
     Args:
         url: TikTok or YouTube video URL
-        
+        ydl: Optional caller-managed YoutubeDL; defaults to the shared one
+
     Returns:
         Dictionary with video information (title, duration, etc.)
     """
     if not validate_url(url):
         raise ValueError(f"Unsupported URL: {url}. Must be from TikTok or YouTube.")
-    
-    # Try both yt-dlp and python3 -m yt_dlp
-    yt_dlp_cmd = None
-    try:
-        subprocess.run(["yt-dlp", "--version"], capture_output=True, check=True)
-        yt_dlp_cmd = ["yt-dlp"]
-    except:
+
+    # In-process metadata extraction when the library is available
+    if YoutubeDL is not None:
         try:
-            subprocess.run(["python3", "-m", "yt_dlp", "--version"], capture_output=True, check=True)
-            yt_dlp_cmd = ["python3", "-m", "yt_dlp"]
-        except:
-            raise FileNotFoundError("yt-dlp is not installed")
-    
+            if ydl is None:
+                ydl = get_ydl()
+            info = ydl.extract_info(url, download=False)
+            return ydl.sanitize_info(info)
+        except Exception as e:
+            raise RuntimeError(f"Failed to get video info: {e}")
+
+    # Probe runs once per interpreter
+    yt_dlp_cmd = _which_ytdlp()
+    if yt_dlp_cmd is None:
+        raise FileNotFoundError("yt-dlp is not installed")
+
     try:
         result = subprocess.run(
-            yt_dlp_cmd + ["--dump-json", url],
+            list(yt_dlp_cmd) + ["--dump-json", url],
             capture_output=True,
             text=True,
             check=True
@@ -4,6 +4,12 @@ Process an entire TikTok or YouTube channel and generate notes for all videos.
 """
 import sys
 import os
+import re
+import atexit
+import logging
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Optional
 
@@ -11,11 +17,14 @@ from typing import List, Optional
 sys.path.insert(0, str(Path(__file__).parent))
 
 from scrape.scrape_videos import scrape_videos, is_tiktok_url, is_youtube_url
+from download.download_video import download_videos, download_videos_batch
 from run_pipeline import run_pipeline
 from utils.processing_state import (
     load_processing_state,
     save_processing_state,
     create_initial_state,
+    build_notes_index,
+    StateSaver,
     is_video_processed,
     find_resume_index,
     update_processing_state,
@@ -23,17 +32,75 @@ from utils.processing_state import (
 )
 
 
+# Per-video progress goes through logging with lazy %-formatting so message
+# strings are only built when actually emitted
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+log = logging.getLogger("process_channel")
+
+# Channel-name extraction patterns compiled once at module load
+_AT_NAME_RE = re.compile(r'@([^/?]+)')
+_YT_CHANNEL_RE = re.compile(r'/(?:channel|c|user)/([^/?]+)')
+
+# Punctuation stripper compiled once. The slug must reproduce the legacy
+# four-pass mapping exactly (punctuation deleted, spaces to underscores):
+# channel directory names are persisted on disk, so any divergence orphans
+# existing channels' state files and notes
+_SANITIZE_RE = re.compile(r'[^\w\s-]+')
+
+
+def sanitize_channel_name(channel_name: Optional[str]) -> str:
+    """Sanitize a channel name into a directory-safe lowercase slug."""
+    if not channel_name:
+        return "unknown_channel"
+    return _SANITIZE_RE.sub('', channel_name).strip().replace(' ', '_').lower() or "unknown_channel"
+
+# Guards state updates when pipeline results stream in from worker processes
+_state_lock = threading.Lock()
+
+
+def _process_one(
+    video_url: str,
+    output_dir: str,
+    channel_name: Optional[str],
+    video_num: int,
+    total_videos: int,
+    ffmpeg_threads: int = 1
+) -> Optional[str]:
+    """
+    Run the full pipeline for a single video (worker process entry point).
+
+    Must be a top-level function so it can be pickled by ProcessPoolExecutor.
+
+    Args:
+        video_url: Video URL to process
+        output_dir: Base directory to save all outputs
+        channel_name: Channel name (passed through to run_pipeline)
+        video_num: 1-based position of this video (for progress display)
+        total_videos: Total number of videos (for progress display)
+
+    Returns:
+        Path to generated notes file, or None if the pipeline failed
+    """
+    log.info("\n%s", "=" * 70)
+    log.info("📹 Video %d/%d: %s", video_num, total_videos, video_url)
+    log.info("%s", "=" * 70)
+    return run_pipeline(video_url, output_dir, channel_name=channel_name, video_num=video_num, total_videos=total_videos, ffmpeg_threads=ffmpeg_threads)
+
+
 def process_channel(
     channel_url: str,
     output_dir: str = "output",
     max_videos: int = None,
     skip_existing: bool = True,
     resume: bool = True,
-    reset: bool = False
+    reset: bool = False,
+    workers: int = None,
+    parallel_downloads: int = None,
+    batch_download: bool = False
 ):
     """
     Process all videos from a channel and generate notes.
-    
+
     Args:
         channel_url: TikTok or YouTube channel URL
         output_dir: Base directory to save all outputs
@@ -41,6 +108,11 @@ def process_channel(
         skip_existing: Skip videos that already have notes generated
         resume: Resume from last processed video (default: True)
         reset: Reset processing state and start fresh (default: False)
+        workers: Number of parallel worker processes (default: os.cpu_count())
+        parallel_downloads: If set, prefetch pending videos with this many
+                           concurrent downloads before processing starts
+        batch_download: Prefetch all pending videos with one yt-dlp batch
+                       invocation (shared HTTP session) before processing
     """
     print("=" * 70)
     print("CHANNEL PROCESSING: Generate Notes for All Videos")
@@ -76,27 +148,23 @@ def process_channel(
         return
     
     # Extract channel name from URL
-    import re
     channel_name = None
     if is_tiktok_url(channel_url):
-        match = re.search(r'@([^/?]+)', channel_url)
+        match = _AT_NAME_RE.search(channel_url)
         channel_name = match.group(1) if match else None
     elif is_youtube_url(channel_url):
         # Try to extract from channel URL pattern
-        match = re.search(r'@([^/?]+)', channel_url)
+        match = _AT_NAME_RE.search(channel_url)
         if match:
             channel_name = match.group(1)
         else:
             # Try /channel/ or /c/ pattern
-            match = re.search(r'/(?:channel|c|user)/([^/?]+)', channel_url)
+            match = _YT_CHANNEL_RE.search(channel_url)
             if match:
                 channel_name = match.group(1)
-    
+
     # Clean channel name for directory
-    if channel_name:
-        channel_name_clean = re.sub(r'[^\w\s-]', '', channel_name).strip().replace(' ', '_').lower()
-    else:
-        channel_name_clean = "unknown_channel"
+    channel_name_clean = sanitize_channel_name(channel_name)
     
     # Channel-specific directories
     channel_dir = Path(output_dir) / channel_name_clean
@@ -130,68 +198,143 @@ def process_channel(
             print("ℹ️  Last processed video not found in current list, starting from beginning")
     
     # Step 2: Process each video
+    if workers is None:
+        workers = os.cpu_count() or 1
+
     print("=" * 70)
     print(f"PROCESSING {len(video_urls) - start_index} VIDEOS (starting from index {start_index + 1})")
     print(f"Channel: {channel_name or 'Unknown'}")
+    print(f"Workers: {workers}")
     print("=" * 70)
     print()
-    
+
     successful = 0
     failed = 0
     skipped = 0
-    
+
+    # Per-video updates go to the append-only delta log (O(1) each); the
+    # periodic snapshot flushes below compact that log. Flush on exit (and
+    # on SIGINT/SIGTERM) so the snapshot is current
+    saver = StateSaver()
+    atexit.register(lambda: saver.maybe_flush(channel_dir, state, force=True))
+
+    # Pool workers fork after these handlers are installed and Ctrl+C hits
+    # the whole process group, so only the installing process may flush —
+    # a worker flushing its stale fork-time copy of `state` would race the
+    # parent on the shared snapshot files and erase newer delta records
+    _handler_pid = os.getpid()
+
+    def _flush_on_signal(signum, frame):
+        if os.getpid() != _handler_pid:
+            signal.signal(signum, signal.SIG_DFL)
+            os.kill(os.getpid(), signum)
+            return
+        saver.maybe_flush(channel_dir, state, force=True)
+        sys.exit(128 + signum)
+
+    signal.signal(signal.SIGINT, _flush_on_signal)
+    signal.signal(signal.SIGTERM, _flush_on_signal)
+
+    # First pass: filter out already-processed videos (state checks stay in the
+    # main process), collecting the rest as jobs for the worker pool
+    notes_index = build_notes_index(notes_dir)
+    jobs = []  # (index, video_url, video_id)
     for i, video_url in enumerate(video_urls[start_index:], start=start_index + 1):
-        print(f"\n{'=' * 70}")
-        print(f"📹 Video {i}/{len(video_urls)}: {video_url}")
-        print("=" * 70)
-        
-        # Extract video ID
         video_id = extract_video_id(video_url)
-        
+
         # Check if notes already exist (skip if requested)
         if skip_existing and video_id:
-            is_processed, notes_filename = is_video_processed(video_id, state, notes_dir)
+            is_processed, notes_filename = is_video_processed(video_id, state, notes_dir, notes_index)
             if is_processed:
-                print(f"⏭️  Skipping (notes already exist: {notes_filename})")
-                print(f"   Progress: {i}/{len(video_urls)} videos processed")
+                log.info("⏭️  Skipping video %d/%d (notes already exist: %s)", i, len(video_urls), notes_filename)
                 skipped += 1
                 # Update state for skipped video
-                state = update_processing_state(state, video_id, video_url, notes_filename, status="skipped")
-                save_processing_state(channel_dir, state)
+                state = update_processing_state(state, video_id, video_url, notes_filename, status="skipped", channel_dir=channel_dir)
+                saver.mark_dirty()
+                saver.maybe_flush(channel_dir, state)
                 continue
-        
-        # Run pipeline for this video with channel name
-        notes_path = None
+
+        jobs.append((i, video_url, video_id))
+
+    # Optional prefetch: download all pending videos in one yt-dlp batch
+    # process so the pipeline workers find them already cached
+    if batch_download and jobs:
+        print(f"⬇️  Batch-downloading {len(jobs)} videos with a single yt-dlp process...")
         try:
-            notes_path = run_pipeline(video_url, output_dir, channel_name=channel_name, video_num=i, total_videos=len(video_urls))
-            if notes_path:
-                successful += 1
-                notes_filename = Path(notes_path).name
-                print(f"✅ Video {i}/{len(video_urls)} completed successfully")
-                
-                # Update state for successful processing
-                if video_id:
-                    state = update_processing_state(state, video_id, video_url, notes_filename, status="success")
-                    state["last_processed_index"] = i - 1  # 0-indexed
-                    save_processing_state(channel_dir, state)
-            else:
+            download_videos_batch(
+                [video_url for _, video_url, _ in jobs],
+                str(channel_dir / "videos")
+            )
+        except Exception as e:
+            print(f"⚠️  Batch download failed ({e}); the pipeline will download per video")
+
+    # Optional prefetch: download all pending videos concurrently so the
+    # pipeline workers find them already cached
+    if parallel_downloads and jobs:
+        print(f"⬇️  Prefetching {len(jobs)} videos ({parallel_downloads} concurrent downloads)...")
+        # Write into the channel's videos dir — the same {video_id}.mp4
+        # paths the pipeline workers check — so the prefetch actually
+        # primes their download cache
+        results = download_videos(
+            [video_url for _, video_url, _ in jobs],
+            concurrency=parallel_downloads,
+            output_dir=str(channel_dir / "videos")
+        )
+        prefetch_failed = sum(1 for r in results if isinstance(r, BaseException))
+        if prefetch_failed:
+            print(f"⚠️  {prefetch_failed} prefetch download(s) failed; the pipeline will retry them")
+
+    # Second pass: run the pipeline for remaining videos in parallel,
+    # updating state incrementally as each video completes. Split the core
+    # budget across workers so their ffmpeg children don't oversubscribe.
+    per_job_threads = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_process_one, video_url, output_dir, channel_name, i, len(video_urls), per_job_threads): (i, video_url, video_id)
+            for i, video_url, video_id in jobs
+        }
+
+        for future in as_completed(futures):
+            i, video_url, video_id = futures[future]
+            notes_path = None
+            try:
+                notes_path = future.result()
+                if notes_path:
+                    successful += 1
+                    notes_filename = Path(notes_path).name
+                    log.info("✅ Video %d/%d completed successfully", i, len(video_urls))
+
+                    # Update state for successful processing
+                    if video_id:
+                        with _state_lock:
+                            state = update_processing_state(state, video_id, video_url, notes_filename, status="success", channel_dir=channel_dir)
+                            state["last_processed_index"] = i - 1  # 0-indexed
+                            saver.mark_dirty()
+                            saver.maybe_flush(channel_dir, state)
+                else:
+                    failed += 1
+                    log.info("⚠️  Video %d/%d completed with warnings", i, len(video_urls))
+
+                    # Update state for failed processing
+                    if video_id:
+                        with _state_lock:
+                            state = update_processing_state(state, video_id, video_url, None, status="failed", channel_dir=channel_dir)
+                            saver.mark_dirty()
+                            saver.maybe_flush(channel_dir, state)
+            except Exception as e:
                 failed += 1
-                print(f"⚠️  Video {i}/{len(video_urls)} completed with warnings")
-                
+                log.info("❌ Video %d/%d failed: %s", i, len(video_urls), e)
+
                 # Update state for failed processing
                 if video_id:
-                    state = update_processing_state(state, video_id, video_url, None, status="failed")
-                    save_processing_state(channel_dir, state)
-        except Exception as e:
-            failed += 1
-            print(f"❌ Video {i}/{len(video_urls)} failed: {e}")
-            
-            # Update state for failed processing
-            if video_id:
-                state = update_processing_state(state, video_id, video_url, None, status="failed")
-                save_processing_state(channel_dir, state)
-            continue
-    
+                    with _state_lock:
+                        state = update_processing_state(state, video_id, video_url, None, status="failed", channel_dir=channel_dir)
+                        saver.mark_dirty()
+                        saver.maybe_flush(channel_dir, state)
+
+    # All videos done: make sure the final state is on disk
+    saver.maybe_flush(channel_dir, state, force=True)
+
     # Summary
     print("\n" + "=" * 70)
     print("CHANNEL PROCESSING SUMMARY")
@@ -206,20 +349,46 @@ def process_channel(
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python3 process_channel.py <channel_url> [output_dir] [max_videos]")
+    # Parse optional flags before positional args
+    args = sys.argv[1:]
+
+    def _pop_int_flag(name):
+        if name not in args:
+            return None
+        flag_index = args.index(name)
+        try:
+            value = int(args[flag_index + 1])
+        except (IndexError, ValueError):
+            print(f"❌ {name} requires an integer value")
+            sys.exit(1)
+        del args[flag_index:flag_index + 2]
+        return value
+
+    workers = _pop_int_flag("--workers")
+    parallel_downloads = _pop_int_flag("--parallel-downloads")
+
+    batch_download = "--batch-download" in args
+    if batch_download:
+        args.remove("--batch-download")
+
+    if len(args) < 1:
+        print("Usage: python3 process_channel.py <channel_url> [output_dir] [max_videos] [--workers N] [--parallel-downloads N]")
         print("\nExamples:")
         print("  python3 process_channel.py 'https://www.tiktok.com/@username'")
         print("  python3 process_channel.py 'https://www.youtube.com/@channel' output 20")
+        print("  python3 process_channel.py 'https://www.youtube.com/@channel' output 20 --workers 4")
         print("\nOptions:")
         print("  channel_url: TikTok or YouTube channel URL")
         print("  output_dir: Base directory (default: output)")
         print("  max_videos: Maximum videos to process (default: all for TikTok, 10 for YouTube)")
+        print("  --workers: Number of parallel worker processes (default: CPU count)")
+        print("  --parallel-downloads: Prefetch videos with N concurrent downloads")
+        print("  --batch-download: Prefetch all videos with one yt-dlp batch process")
         sys.exit(1)
-    
-    channel_url = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else "output"
-    max_videos = int(sys.argv[3]) if len(sys.argv) > 3 else None
-    
-    process_channel(channel_url, output_dir, max_videos)
+
+    channel_url = args[0]
+    output_dir = args[1] if len(args) > 1 else "output"
+    max_videos = int(args[2]) if len(args) > 2 else None
+
+    process_channel(channel_url, output_dir, max_videos, workers=workers, parallel_downloads=parallel_downloads, batch_download=batch_download)
 
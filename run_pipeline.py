@@ -2,235 +2,520 @@
 """
 Complete pipeline: Download video → Extract audio → Transcribe → Generate notes
 """
+import atexit
 import sys
 import os
+import hashlib
+import logging
+import logging.handlers
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from download.download_video import download_video, get_video_info
-from audio.extract_audio import extract_audio
-from transcript.transcribe import transcribe_audio, check_openai_available
-from summarize.summarize_notes import summarize_transcript
+from audio.extract_audio import extract_audio, extract_audio_to_ndarray
+from transcript.transcribe import transcribe_audio_chunked, check_openai_available, check_whisper_local_available
+from summarize.summarize_notes import summarize_transcript, summarize_with_title
+import re
 
+# Pipeline progress goes through a buffered logger: per-message prints each
+# take the stdout lock and flush, which serializes the stage threads on slow
+# terminals/CI log collectors. The MemoryHandler batches records and flushes
+# every `capacity` messages (immediately on errors, and at exit).
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(logging.Formatter("%(message)s"))
+_buffer_handler = logging.handlers.MemoryHandler(
+    capacity=100, flushLevel=logging.ERROR, target=_stream_handler
+)
+log = logging.getLogger("pipeline")
+log.setLevel(logging.INFO)
+log.addHandler(_buffer_handler)
+log.propagate = False
+atexit.register(_buffer_handler.close)
 
-def run_pipeline(url: str, output_dir: str = "output", channel_name: str = None, video_num: int = None, total_videos: int = None):
+# Punctuation stripper for directory-safe channel slugs, compiled once
+# (matches process_channel.sanitize_channel_name — the slug must keep
+# reproducing the legacy mapping so existing channel dirs stay addressable)
+_SANITIZE_RE = re.compile(r'[^\w\s-]+')
+
+# URL/text patterns compiled once at module load; these run on every URL
+# and every generated note in batch runs
+_TIKTOK_USER_RE = re.compile(r'@([^/]+)')
+_TIKTOK_VID_RE = re.compile(r'/video/(\d+)')
+# Fixed-width ID match with explicit prefixes: no trailing .* (which forced
+# a scan of the rest of the URL) and no bare / alternative
+_YT_ID_RE = re.compile(r'(?:v=|youtu\.be/|/shorts/|/embed/)([0-9A-Za-z_-]{11})')
+_CLEAN_RE = re.compile(r'[^\w\s-]')
+_H1_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+
+
+# Marks end-of-stream on the inter-stage queues in run_pipeline_staged
+_SENTINEL = object()
+
+# On-disk cache for generated titles: the title prompt is deterministic
+# (temperature aside, identical prefix + model gives a usable title), so
+# re-runs skip the OpenAI roundtrip
+_TITLE_CACHE_DIR = Path(os.getenv("STUDY_NOTES_CACHE_DIR", str(Path.home() / ".cache" / "study_notes"))) / "titles"
+
+# Shared OpenAI client for title generation: one connection pool (and TLS
+# handshake) reused across all videos in a batch run
+_OPENAI_CLIENT = None
+
+
+def _get_openai_client():
+    """Return the module-wide OpenAI client, creating it on first use."""
+    global _OPENAI_CLIENT
+    if _OPENAI_CLIENT is None:
+        from openai import OpenAI
+        _OPENAI_CLIENT = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _OPENAI_CLIENT
+
+
+def _resolve_output_dirs(url: str, output_dir: str, channel_name: str = None):
     """
-    Run complete pipeline from video URL to study notes.
-    
+    Resolve video ID, channel name and output directory layout for a URL.
+
     Args:
         url: TikTok or YouTube video URL
         output_dir: Base directory to save all outputs
-        channel_name: Optional channel name (if not provided, will be extracted from URL)
-        video_num: Optional video number (for progress display)
-        total_videos: Optional total videos (for progress display)
+        channel_name: Optional channel name (if not provided, extracted from URL)
+
+    Returns:
+        Tuple of (video_id, channel_name, dirs) where dirs maps
+        "videos"/"audio"/"transcripts"/"notes" to created directories
     """
-    progress_prefix = ""
-    if video_num is not None and total_videos is not None:
-        progress_prefix = f"[Video {video_num}/{total_videos}] "
-    
-    print("=" * 70)
-    print(f"{progress_prefix}COMPLETE PIPELINE: Video URL → Study Notes")
-    print("=" * 70)
-    print(f"\nURL: {url}\n")
-    
-    # Extract video ID and channel name for filename
-    import re
     video_id = None
-    
+
     if "tiktok.com" in url:
         # Extract TikTok username if not provided
         if channel_name is None:
-            match = re.search(r'@([^/]+)', url)
+            match = _TIKTOK_USER_RE.search(url)
             channel_name = match.group(1) if match else "tiktok_user"
-        match = re.search(r'/video/(\d+)', url)
+        match = _TIKTOK_VID_RE.search(url)
         video_id = match.group(1) if match else "tiktok_video"
     elif "youtube.com" in url or "youtu.be" in url:
-        match = re.search(r'(?:v=|\/)([0-9A-Za-z_-]{11}).*', url)
-        video_id = match.group(1) if match else "youtube_video"
+        match = _YT_ID_RE.search(url)
+        # Reject unparseable URLs outright: a shared "youtube_video"
+        # fallback ID would collide across unrelated videos (overwriting
+        # outputs and duplicating transcription work)
+        if not match:
+            raise ValueError(f"Could not extract YouTube video ID from URL: {url}")
+        video_id = match.group(1)
         # Try to get channel name from video info if not provided
         if channel_name is None:
             try:
                 info = get_video_info(url)
                 channel_name = info.get('uploader', info.get('channel', 'youtube_channel'))
                 # Clean channel name for filename (remove special chars)
-                channel_name = re.sub(r'[^\w\s-]', '', channel_name).strip().replace(' ', '_')
+                channel_name = _CLEAN_RE.sub('', channel_name).strip().replace(' ', '_')
             except:
                 channel_name = "youtube_channel"
     else:
         video_id = "video"
         if channel_name is None:
             channel_name = "unknown_channel"
-    
+
     # Fallback if channel name not found
     if not channel_name:
         channel_name = "unknown_channel"
-    
-    # Clean channel name for directory (remove special chars, lowercase)
-    channel_name_clean = re.sub(r'[^\w\s-]', '', channel_name).strip().replace(' ', '_').lower()
-    
+
+    # Clean channel name for directory (one regex pass: lowercase slug)
+    channel_name_clean = _SANITIZE_RE.sub('', channel_name).strip().replace(' ', '_').lower() or "unknown_channel"
+
     # Create output directory structure with channel subfolder
     output_path = Path(output_dir) / channel_name_clean
-    videos_dir = output_path / "videos"
-    audio_dir = output_path / "audio"
-    transcripts_dir = output_path / "transcripts"
-    notes_dir = output_path / "notes"
-    
+    dirs = {
+        "videos": output_path / "videos",
+        "audio": output_path / "audio",
+        "transcripts": output_path / "transcripts",
+        "notes": output_path / "notes",
+    }
+
     # Create all directories
-    videos_dir.mkdir(parents=True, exist_ok=True)
-    audio_dir.mkdir(parents=True, exist_ok=True)
-    transcripts_dir.mkdir(parents=True, exist_ok=True)
-    notes_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Step 1: Download video
-    print(f"📹 Step 1/6: Downloading video...")
+    for directory in dirs.values():
+        directory.mkdir(parents=True, exist_ok=True)
+
+    return video_id, channel_name, dirs
+
+
+def _download_step(url: str, videos_dir: Path, video_id: str):
+    """Step 1: Download the video. Returns the downloaded path or None."""
+    log.info(f"📹 Step 1/6: Downloading video...")
     try:
-        video_path = str(videos_dir / f"{video_id}.mp4")
+        video_path = os.path.join(os.fspath(videos_dir), f"{video_id}.mp4")
         downloaded_path = download_video(url, video_path)
-        print(f"✅ Video downloaded: {downloaded_path}")
-        print(f"   File size: {Path(downloaded_path).stat().st_size / (1024*1024):.2f} MB")
+        log.info(f"✅ Video downloaded: {downloaded_path}")
+        log.info(f"   File size: {os.stat(downloaded_path).st_size / 1_048_576:.2f} MB")
+        return downloaded_path
     except Exception as e:
-        print(f"❌ Download failed: {e}")
+        log.error(f"❌ Download failed: {e}")
         return None
-    
-    # Step 2: Extract audio
-    print(f"\n🎤 Step 2/6: Extracting audio from video...")
+
+
+def _extract_step(downloaded_path: str, audio_dir: Path, video_id: str, ffmpeg_threads: int = 1):
+    """Step 2: Extract audio from the video. Returns the audio path or None."""
+    log.info(f"\n🎤 Step 2/6: Extracting audio from video...")
     try:
-        audio_path = str(audio_dir / f"{video_id}.wav")
-        extracted_audio = extract_audio(downloaded_path, audio_path)
-        print(f"✅ Audio extracted: {extracted_audio}")
-        print(f"   File size: {Path(extracted_audio).stat().st_size / (1024*1024):.2f} MB")
+        audio_path = os.path.join(os.fspath(audio_dir), f"{video_id}.wav")
+        extracted_audio = extract_audio(downloaded_path, audio_path, threads=ffmpeg_threads)
+        log.info(f"✅ Audio extracted: {extracted_audio}")
+        log.info(f"   File size: {os.stat(extracted_audio).st_size / 1_048_576:.2f} MB")
+        return extracted_audio
     except Exception as e:
-        print(f"❌ Audio extraction failed: {e}")
+        log.error(f"❌ Audio extraction failed: {e}")
         return None
-    
-    # Step 3: Transcribe audio
-    print(f"\n📝 Step 3/6: Transcribing audio to text...")
+
+
+def _transcribe_step(extracted_audio: str, transcripts_dir: Path, video_id: str, use_local: bool = None):
+    """Step 3: Transcribe the audio. Returns (transcript, transcript_path) or None."""
+    log.info(f"\n📝 Step 3/6: Transcribing audio to text...")
     from transcript.transcribe import check_whisper_local_available
-    
-    # Use local Whisper if available, otherwise try API
-    use_local = check_whisper_local_available()
+
+    # Use local Whisper if available, otherwise try API (batch callers pass
+    # the availability check in so it isn't recomputed per video)
+    if use_local is None:
+        use_local = check_whisper_local_available()
     if use_local:
-        print("   Using local Whisper model (no API key needed)")
+        from transcript.transcribe import local_backend_description
+        log.info(f"   Using local Whisper model ({local_backend_description()}; no API key needed)")
     elif not check_openai_available():
-        print("⚠️  Local Whisper not available and OPENAI_API_KEY not set.")
-        print("   Install local Whisper: pip install openai-whisper")
-        print("   Or set API key: export OPENAI_API_KEY='your-key-here'")
-        print("\n✅ Pipeline completed up to audio extraction.")
-        print(f"   Audio file: {extracted_audio}")
+        log.info("⚠️  Local Whisper not available and OPENAI_API_KEY not set.")
+        log.info("   Install local Whisper: pip install openai-whisper")
+        log.info("   Or set API key: export OPENAI_API_KEY='your-key-here'")
+        log.info("\n✅ Pipeline completed up to audio extraction.")
+        log.info(f"   Audio file: {extracted_audio}")
         return None
     else:
-        print("   Using OpenAI Whisper API")
-    
+        log.info("   Using OpenAI Whisper API")
+
     try:
-        transcript = transcribe_audio(extracted_audio, language="en", use_local=use_local, model_size="base")
-        print(f"✅ Transcript created: {len(transcript)} characters")
-        
+        # Chunked variant: long audio on the API path is split into
+        # overlapping 30s chunks transcribed concurrently
+        transcript = transcribe_audio_chunked(extracted_audio, language="en", use_local=use_local, model_size="base")
+        log.info(f"✅ Transcript created: {len(transcript)} characters")
+
         # Save transcript
-        transcript_path = str(transcripts_dir / f"{video_id}.txt")
+        transcript_path = os.path.join(os.fspath(transcripts_dir), f"{video_id}.txt")
         with open(transcript_path, "w", encoding="utf-8") as f:
             f.write(transcript)
-        print(f"✅ Transcript saved to: {transcript_path}")
-        
-        # Show preview
-        print("\n--- Transcript Preview (first 500 chars) ---")
-        print(transcript[:500] + "..." if len(transcript) > 500 else transcript)
-        print("--- End Preview ---\n")
-        
+        log.info(f"✅ Transcript saved to: {transcript_path}")
+
+        # Show preview (slice once; long transcripts can be megabytes)
+        preview = transcript[:500]
+        log.info("\n--- Transcript Preview (first 500 chars) ---")
+        log.info(preview + "..." if len(transcript) > 500 else transcript)
+        log.info("--- End Preview ---\n")
+
+        return transcript, transcript_path
+
     except Exception as e:
-        print(f"❌ Transcription failed: {e}")
+        log.error(f"❌ Transcription failed: {e}")
         return None
-    
-    # Step 4: Generate notes
-    print(f"📚 Step 4/6: Generating markdown notes from transcript...")
+
+
+def _notes_step(
+    transcript: str,
+    video_id: str,
+    channel_name: str,
+    notes_dir: Path,
+    cleanup_paths
+):
+    """Steps 4-6: Generate notes, title them, save and clean up.
+
+    Returns the notes path or None."""
+    log.info(f"📚 Step 4/6: Generating markdown notes from transcript...")
     try:
-        notes = summarize_transcript(transcript, model="gpt-4o-mini")
-        print(f"✅ Notes generated: {len(notes)} characters")
-        
-        # Generate title from notes using AI
-        print(f"\n📝 Step 5/6: Generating title for notes...")
+        # One fused call returns notes and title together (one round-trip);
+        # fall back to the separate calls if the JSON comes back unusable
+        title = None
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-            
-            # Extract title from notes (first heading) or generate one
-            title_match = re.search(r'^#\s+(.+)$', notes, re.MULTILINE)
-            if title_match:
+            fused = summarize_with_title(transcript, model="gpt-4o-mini")
+            title, notes = fused["title"], fused["notes"]
+            log.info(f"✅ Notes generated: {len(notes)} characters")
+        except Exception as e:
+            log.info(f"⚠️  Combined notes+title call failed ({e}); using separate calls")
+            notes = summarize_transcript(transcript, model="gpt-4o-mini")
+            log.info(f"✅ Notes generated: {len(notes)} characters")
+
+        # Generate title from notes using AI (already done if the fused call
+        # succeeded)
+        log.info(f"\n📝 Step 5/6: Generating title for notes...")
+        try:
+            # Extract title from notes (first heading) if not already fused
+            title_match = _H1_RE.search(notes) if title is None else None
+            if title is not None:
+                log.info("   Title generated in the same call as the notes")
+            elif title_match:
                 title = title_match.group(1).strip()
             else:
-                # Generate a concise title from transcript
-                title_response = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "Generate a concise, descriptive title (3-8 words) for study notes based on the transcript. Return only the title, no quotes or extra text."
-                        },
-                        {
-                            "role": "user",
-                            "content": f"Transcript: {transcript[:500]}\n\nGenerate a concise title for these study notes:"
-                        }
-                    ],
-                    temperature=0.3,
-                    max_tokens=20
-                )
-                title = title_response.choices[0].message.content.strip().strip('"').strip("'")
-            
+                # One prefix slice shared by the cache key and the prompt
+                preview = transcript[:500]
+
+                # Check the on-disk cache first (keyed by prompt content)
+                title = None
+                title_key = hashlib.sha256(f"gpt-4o-mini:{preview}".encode("utf-8")).hexdigest()
+                title_cache = _TITLE_CACHE_DIR / f"{title_key}.txt"
+                try:
+                    title = title_cache.read_text(encoding="utf-8").strip() or None
+                except OSError:
+                    pass
+
+                if title is None:
+                    # Generate a concise title from transcript
+                    client = _get_openai_client()
+                    title_response = client.chat.completions.create(
+                        model="gpt-4o-mini",
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": "Generate a concise, descriptive title (3-8 words) for study notes based on the transcript. Return only the title, no quotes or extra text."
+                            },
+                            {
+                                "role": "user",
+                                "content": f"Transcript: {preview}\n\nGenerate a concise title for these study notes:"
+                            }
+                        ],
+                        temperature=0.3,
+                        max_tokens=20
+                    )
+                    title = title_response.choices[0].message.content.strip().strip('"').strip("'")
+                    try:
+                        _TITLE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                        title_cache.write_text(title, encoding="utf-8")
+                    except OSError:
+                        pass  # Cache is best-effort
+
             # Clean title for filename (remove special chars, limit length)
-            title_clean = re.sub(r'[^\w\s-]', '', title).strip().replace(' ', '_')
+            title_clean = _CLEAN_RE.sub('', title).strip().replace(' ', '_')
             title_clean = title_clean[:50]  # Limit length
-            
+
             # Create filename: channel_name:title.md
             notes_filename = f"{channel_name}:{title_clean}.md"
-            
+
         except Exception as e:
-            print(f"⚠️  Title generation failed, using video ID: {e}")
+            log.info(f"⚠️  Title generation failed, using video ID: {e}")
             notes_filename = f"{channel_name}:{video_id}.md"
-        
+
         # Save notes
-        notes_path = str(notes_dir / notes_filename)
+        notes_path = os.path.join(os.fspath(notes_dir), notes_filename)
         with open(notes_path, "w", encoding="utf-8") as f:
             f.write(notes)
-        print(f"✅ Notes saved to: {notes_path}")
-        
+        log.info(f"✅ Notes saved to: {notes_path}")
+
         # Show notes
-        print("\n" + "=" * 70)
-        print("GENERATED STUDY NOTES")
-        print("=" * 70)
-        print(notes)
-        print("=" * 70)
-        
+        log.info("\n" + "=" * 70)
+        log.info("GENERATED STUDY NOTES")
+        log.info("=" * 70)
+        log.info(notes)
+        log.info("=" * 70)
+
         # Step 6: Clean up intermediate files
-        print(f"\n🧹 Step 6/6: Cleaning up intermediate files...")
+        log.info(f"\n🧹 Step 6/6: Cleaning up intermediate files...")
         files_deleted = []
-        files_to_delete = [
-            ("Video", Path(downloaded_path)),
-            ("Audio", Path(extracted_audio)),
-            ("Transcript", Path(transcript_path))
-        ]
-        
-        for file_type, file_path in files_to_delete:
-            if file_path.exists():
-                try:
-                    file_path.unlink()
-                    files_deleted.append(file_type)
-                    print(f"✅ Deleted {file_type.lower()}: {file_path.name}")
-                except Exception as e:
-                    print(f"⚠️  Failed to delete {file_type.lower()}: {e}")
-            else:
-                print(f"ℹ️  {file_type} file not found (may have been deleted already): {file_path.name}")
-        
+
+        # Delete directly and treat "already gone" as a non-error — one
+        # unlink syscall instead of an exists() probe followed by unlink
+        for file_type, file_path in cleanup_paths:
+            try:
+                file_path.unlink()
+                files_deleted.append(file_type)
+                log.info(f"✅ Deleted {file_type.lower()}: {file_path.name}")
+            except FileNotFoundError:
+                log.info(f"ℹ️  {file_type} file not found (may have been deleted already): {file_path.name}")
+            except Exception as e:
+                log.info(f"⚠️  Failed to delete {file_type.lower()}: {e}")
+
         if files_deleted:
-            print(f"✅ Cleaned up {len(files_deleted)} intermediate file(s)")
+            log.info(f"✅ Cleaned up {len(files_deleted)} intermediate file(s)")
         else:
-            print("ℹ️  No intermediate files to clean up")
-        
+            log.info("ℹ️  No intermediate files to clean up")
+
         return notes_path
-        
+
     except Exception as e:
-        print(f"❌ Note generation failed: {e}")
+        log.error(f"❌ Note generation failed: {e}")
+        return None
+
+
+def run_pipeline(url: str, output_dir: str = "output", channel_name: str = None, video_num: int = None, total_videos: int = None, ffmpeg_threads: int = 1):
+    """
+    Run complete pipeline from video URL to study notes.
+
+    Args:
+        url: TikTok or YouTube video URL
+        output_dir: Base directory to save all outputs
+        channel_name: Optional channel name (if not provided, will be extracted from URL)
+        video_num: Optional video number (for progress display)
+        total_videos: Optional total videos (for progress display)
+        ffmpeg_threads: Thread budget for the ffmpeg extraction step
+    """
+    progress_prefix = ""
+    if video_num is not None and total_videos is not None:
+        progress_prefix = f"[Video {video_num}/{total_videos}] "
+
+    log.info("=" * 70)
+    log.info(f"{progress_prefix}COMPLETE PIPELINE: Video URL → Study Notes")
+    log.info("=" * 70)
+    log.info(f"\nURL: {url}\n")
+
+    video_id, channel_name, dirs = _resolve_output_dirs(url, output_dir, channel_name)
+
+    # Step 1: Download video
+    downloaded_path = _download_step(url, dirs["videos"], video_id)
+    if downloaded_path is None:
+        return None
+
+    # Step 2: Extract audio. With local Whisper available, decode the PCM
+    # straight into memory and skip the .wav write+read roundtrip; the
+    # on-disk path remains the fallback (and is required by the API backend,
+    # which uploads a real file)
+    extracted_audio = None
+    audio_input = None
+    if check_whisper_local_available():
+        log.info(f"\n🎤 Step 2/6: Decoding audio into memory (no .wav written)...")
+        try:
+            audio_input = extract_audio_to_ndarray(downloaded_path, threads=ffmpeg_threads)
+            log.info(f"✅ Audio decoded: {len(audio_input) / 16000:.1f}s")
+        except Exception as e:
+            log.info(f"⚠️  In-memory extraction unavailable ({e}); falling back to .wav")
+    if audio_input is None:
+        extracted_audio = _extract_step(downloaded_path, dirs["audio"], video_id, ffmpeg_threads)
+        if extracted_audio is None:
+            return None
+        audio_input = extracted_audio
+
+    # Step 3: Transcribe audio
+    transcribed = _transcribe_step(audio_input, dirs["transcripts"], video_id)
+    if transcribed is None:
         return None
+    transcript, transcript_path = transcribed
+
+    # Steps 4-6: Generate notes, title, save, clean up (no audio file to
+    # clean up when the in-memory path was taken)
+    cleanup_paths = [("Video", Path(downloaded_path))]
+    if extracted_audio is not None:
+        cleanup_paths.append(("Audio", Path(extracted_audio)))
+    cleanup_paths.append(("Transcript", Path(transcript_path)))
+    return _notes_step(transcript, video_id, channel_name, dirs["notes"], cleanup_paths)
+
+
+def run_pipeline_staged(urls, output_dir: str = "output", channel_name: str = None, download_workers: int = 4):
+    """
+    Run the pipeline for many URLs with stages overlapped via bounded queues.
+
+    Four stages, each on its own thread: download → extract → transcribe →
+    notes (main thread) — so the network, ffmpeg, Whisper and the OpenAI API
+    are busy on different videos at the same time instead of each sitting
+    idle while the others work. The small queue bounds keep a slow stage
+    from piling up unbounded work (and disk) behind it.
+
+    Downloads are network-bound, so the download stage runs a small worker
+    pool; the bounded handoff queue still applies backpressure, so at most
+    download_workers + queue-size videos sit on disk awaiting extraction.
+
+    Args:
+        urls: List of video URLs to process
+        output_dir: Base directory to save all outputs
+        channel_name: Optional channel name shared by all URLs
+        download_workers: Number of concurrent downloads
+
+    Returns:
+        Dictionary mapping each URL to its notes path (or None on failure)
+    """
+    from transcript.transcribe import check_whisper_local_available
+
+    results = {}
+    download_queue = queue.Queue(maxsize=2)
+    transcribe_queue = queue.Queue(maxsize=2)
+    notes_queue = queue.Queue(maxsize=2)
+    abort = threading.Event()
+
+    # Probe Whisper availability once for the whole batch, not per video
+    use_local = check_whisper_local_available()
+
+    def download_one(url):
+        if abort.is_set():
+            return
+        try:
+            video_id, name, dirs = _resolve_output_dirs(url, output_dir, channel_name)
+            downloaded_path = _download_step(url, dirs["videos"], video_id)
+        except Exception as e:
+            log.error(f"❌ Download failed: {e}")
+            downloaded_path = None
+        if downloaded_path is None:
+            results[url] = None
+            return
+        download_queue.put((url, video_id, name, dirs, downloaded_path))
+
+    def downloader():
+        # Pool of downloads; the bounded queue put blocks workers when the
+        # extractor falls behind, which caps how much video sits on disk
+        with ThreadPoolExecutor(max_workers=download_workers) as executor:
+            for future in [executor.submit(download_one, url) for url in urls]:
+                future.result()
+        download_queue.put(_SENTINEL)
+
+    def extractor():
+        while True:
+            item = download_queue.get()
+            if item is _SENTINEL:
+                break
+            url, video_id, name, dirs, downloaded_path = item
+            extracted_audio = _extract_step(downloaded_path, dirs["audio"], video_id)
+            if extracted_audio is None:
+                results[url] = None
+                continue
+            transcribe_queue.put((url, video_id, name, dirs, downloaded_path, extracted_audio))
+        transcribe_queue.put(_SENTINEL)
+
+    def transcriber():
+        while True:
+            item = transcribe_queue.get()
+            if item is _SENTINEL:
+                break
+            url, video_id, name, dirs, downloaded_path, extracted_audio = item
+            transcribed = _transcribe_step(
+                extracted_audio, dirs["transcripts"], video_id, use_local=use_local
+            )
+            if transcribed is None:
+                results[url] = None
+                continue
+            transcript, transcript_path = transcribed
+            notes_queue.put((url, video_id, name, dirs, downloaded_path, extracted_audio, transcript, transcript_path))
+        notes_queue.put(_SENTINEL)
+
+    threads = [
+        threading.Thread(target=downloader, daemon=True),
+        threading.Thread(target=extractor, daemon=True),
+        threading.Thread(target=transcriber, daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            item = notes_queue.get()
+            if item is _SENTINEL:
+                break
+            url, video_id, name, dirs, downloaded_path, extracted_audio, transcript, transcript_path = item
+            cleanup_paths = [
+                ("Video", Path(downloaded_path)),
+                ("Audio", Path(extracted_audio)),
+                ("Transcript", Path(transcript_path))
+            ]
+            results[url] = _notes_step(transcript, video_id, name, dirs["notes"], cleanup_paths)
+    except BaseException:
+        abort.set()
+        raise
+    finally:
+        for thread in threads:
+            thread.join(timeout=1)
+
+    return results
 
 
 if __name__ == "__main__":
@@ -239,9 +524,8 @@ if __name__ == "__main__":
         print("\nExample:")
         print("  python3 run_pipeline.py 'https://www.tiktok.com/@preddy_ml/video/7443874677115718942'")
         sys.exit(1)
-    
+
     url = sys.argv[1]
     output_dir = sys.argv[2] if len(sys.argv) > 2 else "output"
-    
-    run_pipeline(url, output_dir)
 
+    run_pipeline(url, output_dir)
@@ -2,28 +2,78 @@
 """
 Run tests and update the dashboard with results.
 """
-import subprocess
+import sys
 import xml.etree.ElementTree as ET
 import re
 from pathlib import Path
 
+import pytest
 
-def run_tests():
-    """Run pytest and generate XML report."""
+# Compiled once at import; extract_test_id runs per testcase and the
+# dashboard patterns run per update
+_TEST_ID_RE = re.compile(r'test_(\d+)_(\d+)')
+_LOAD_FN_RE = re.compile(r'function loadTestStatuses\(\) \{[\s\S]*?\n        \}')
+# Matches any test object's id + status fields: { id: "X.Y", ..., status: "...", ... }
+_TEST_OBJ_RE = re.compile(r'(id:\s*"([^"]+)"[^}]*?status:\s*")[^"]*(")', re.DOTALL)
+
+
+class DashboardCollector:
+    """
+    Pytest plugin that records (nodeid, status) pairs as tests run.
+
+    Collecting statuses in-process skips the JUnit XML serialize/parse
+    round-trip (and the pytest subprocess fork) that the dashboard update
+    previously paid on every run.
+    """
+
+    def __init__(self):
+        self.results = []
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call":
+            status = "passed" if report.outcome == "passed" else (
+                "pending" if report.outcome == "skipped" else "failed"
+            )
+            self.results.append((report.nodeid, status))
+        elif report.when == "setup" and report.outcome != "passed":
+            # Skipped tests (and setup errors) never reach the call phase
+            status = "pending" if report.outcome == "skipped" else "failed"
+            self.results.append((report.nodeid, status))
+
+
+def run_tests(write_xml=False):
+    """
+    Run pytest in-process and collect test statuses directly.
+
+    Args:
+        write_xml: Also write the JUnit XML report (CI back-compat)
+
+    Returns:
+        Tuple of (all tests passed, DashboardCollector with results)
+    """
     print("Running tests...")
-    result = subprocess.run(
-        ["python3", "-m", "pytest", "tests/", "-v", "--junitxml=test_results/test_results.xml", "--tb=short"],
-        capture_output=True,
-        text=True
-    )
-    print(result.stdout)
-    if result.stderr:
-        print(result.stderr)
-    return result.returncode == 0
+    collector = DashboardCollector()
+    args = ["tests/", "-v", "--tb=short"]
+    if write_xml:
+        Path("test_results").mkdir(exist_ok=True)
+        args.append("--junitxml=test_results/test_results.xml")
+    exit_code = pytest.main(args, plugins=[collector])
+    return exit_code == 0, collector
+
+
+def collect_test_statuses(collector):
+    """Map collected (nodeid, status) pairs to dashboard test ids."""
+    test_statuses = {}
+    for nodeid, status in collector.results:
+        test_id = extract_test_id(nodeid)
+        if test_id:
+            test_statuses[test_id] = status
+    return test_statuses
 
 
 def parse_test_results():
-    """Parse JUnit XML and return test statuses."""
+    """Parse JUnit XML and return test statuses (kept for externally
+    generated reports; the normal path collects statuses in-process)."""
     xml_path = Path("test_results/test_results.xml")
     if not xml_path.exists():
         print("No test results XML found")
@@ -59,7 +109,7 @@ def parse_test_results():
 def extract_test_id(test_name):
     """Extract test ID from test name like 'test_1_1_...' -> '1.1'."""
     # Match patterns like test_1_1, test_2_3, test_5_1, etc.
-    match = re.search(r'test_(\d+)_(\d+)', test_name)
+    match = _TEST_ID_RE.search(test_name)
     if match:
         return f"{match.group(1)}.{match.group(2)}"
     return None
@@ -74,16 +124,18 @@ def update_dashboard(test_statuses):
     
     content = dashboard_path.read_text()
     
-    # Update each test status in the JavaScript test data array
-    # The format is: { id: "1.1", ..., status: "pending", ... }
-    for test_id, status in test_statuses.items():
-        # Match the test object with this ID and update its status
-        # Pattern matches: id: "X.Y", ... status: "old_status", ...
-        # We need to match across multiple lines (DOTALL flag)
-        # Match pattern: id: "1.1", ... status: "pending", ...
-        pattern = rf'(id:\s*"{re.escape(test_id)}"[^}}]*?status:\s*")[^"]*(")'
-        replacement = rf'\1{status}\2'
-        content = re.sub(pattern, replacement, content, flags=re.DOTALL)
+    # Update every test status in the JavaScript test data array in a single
+    # pass. The format is: { id: "1.1", ..., status: "pending", ... }.
+    # One linear scan replaces the old per-test-id re.sub loop, which
+    # re-scanned the whole HTML once per test; ids without a new status keep
+    # their current one.
+    def _set_status(match):
+        status = test_statuses.get(match.group(2))
+        if status is None:
+            return match.group(0)
+        return match.group(1) + status + match.group(3)
+
+    content = _TEST_OBJ_RE.sub(_set_status, content)
     
     # Update the loadTestStatuses function with default statuses
     if test_statuses:
@@ -118,8 +170,7 @@ def update_dashboard(test_statuses):
         }}'''
         
         # Find and replace the function
-        pattern = r'function loadTestStatuses\(\) \{[\s\S]*?\n        \}'
-        content = re.sub(pattern, new_function, content)
+        content = _LOAD_FN_RE.sub(lambda m: new_function, content)
     
     dashboard_path.write_text(content)
     print(f"Dashboard updated with {len(test_statuses)} test results")
@@ -131,11 +182,11 @@ def main():
     print("Running Tests and Updating Dashboard")
     print("=" * 60)
     
-    # Run tests
-    success = run_tests()
-    
-    # Parse results
-    test_statuses = parse_test_results()
+    # Run tests (pass --xml to also write the JUnit report for CI)
+    success, collector = run_tests(write_xml="--xml" in sys.argv)
+
+    # Collect results straight from the in-process run
+    test_statuses = collect_test_statuses(collector)
     print(f"\nParsed {len(test_statuses)} test results")
     
     # Update dashboard
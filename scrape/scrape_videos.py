@@ -1,32 +1,287 @@
 """
 Scrape video URLs from TikTok and YouTube.
 """
+import asyncio
+import atexit
+import contextlib
+import functools
+import os
 import re
+import shutil
 import subprocess
 import json
-from typing import List, Optional, Union
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
 from urllib.parse import urlparse, parse_qs
 
 try:
     from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 except ImportError:
-    pass  # Playwright not installed yet
+    sync_playwright = None  # Playwright not installed yet
+    PlaywrightTimeoutError = TimeoutError
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:
+    async_playwright = None
+
+try:
+    from yt_dlp import YoutubeDL
+except ImportError:
+    YoutubeDL = None  # Fall back to the yt-dlp CLI
+
+
+# One flat-extraction YoutubeDL per playlist-end value: reusing the instance
+# keeps yt-dlp's extractor caches and HTTP session warm, and skips a full
+# interpreter fork + arg re-parse per scrape. YoutubeDL is not thread-safe
+# (see download_video.get_ydl), so each cached instance carries its own lock
+# and batch callers on different threads serialize per instance.
+_flat_ydl_cache = {}  # playlist_end -> (ydl, lock)
+_flat_ydl_cache_lock = threading.Lock()
+
+
+def _get_flat_ydl(playlist_end: Optional[int]) -> tuple:
+    """Return a cached (YoutubeDL, lock) pair for the given playlist limit."""
+    with _flat_ydl_cache_lock:
+        entry = _flat_ydl_cache.get(playlist_end)
+        if entry is None:
+            # lazy_playlist makes yt-dlp stop enumerating once playlistend is
+            # reached, so a small limit against a 10k-video channel does
+            # ~limit entries of work instead of scanning the whole list
+            opts = {
+                "quiet": True,
+                "no_warnings": True,
+                "extract_flat": "in_playlist",
+                "lazy_playlist": True,
+                "skip_download": True,
+                "noplaylist": False,
+            }
+            if playlist_end is not None:
+                opts["playlistend"] = playlist_end
+            entry = (YoutubeDL(opts), threading.Lock())
+            _flat_ydl_cache[playlist_end] = entry
+    return entry
+
+
+def _flat_entry_urls(url: str, playlist_end: Optional[int]) -> List[str]:
+    """List entry URLs for a channel/playlist via the embedded yt-dlp API."""
+    ydl, lock = _get_flat_ydl(playlist_end)
+    with lock:
+        info = ydl.extract_info(url, download=False)
+    entries = (info or {}).get("entries") or []
+    return [entry.get("url") for entry in entries if entry.get("url")]
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_ytdlp() -> Optional[str]:
+    """
+    Locate the yt-dlp CLI once per process.
+
+    Only consulted when the yt_dlp module isn't importable; the PATH scan
+    result can't change mid-run, so every caller after the first gets it
+    for free.
+    """
+    return shutil.which("yt-dlp")
+
+
+def _stream_cli_urls(
+    cmd: List[str],
+    hosts: tuple,
+    playlist_end: Optional[int] = None,
+    timeout: float = 60
+) -> List[str]:
+    """
+    Run a yt-dlp CLI listing and stream its stdout line by line.
+
+    Deduplicates in flight (dict keys keep insertion order) and terminates
+    the process early once playlist_end unique URLs have arrived, so memory
+    stays constant and large channels aren't listed to completion just to
+    be truncated afterwards.
+
+    stderr is merged into the stdout stream (keeping a short tail for error
+    reporting, as download_video does): a separate stderr pipe that nobody
+    drains would deadlock yt-dlp once per-entry errors fill the pipe buffer.
+
+    Raises:
+        subprocess.CalledProcessError: If yt-dlp exits nonzero
+        subprocess.TimeoutExpired: If the listing exceeds timeout seconds
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1
+    )
+    seen = {}
+    stopped_early = False
+    output_tail = deque(maxlen=32)
+    timed_out = threading.Event()
+
+    def _kill_on_deadline():
+        timed_out.set()
+        proc.kill()
+
+    # The read loop blocks in readline, so the timeout must bound the whole
+    # listing by wall clock — a wait(timeout=...) after EOF would never fire
+    # against a child that stalls mid-stream
+    watchdog = threading.Timer(timeout, _kill_on_deadline)
+    watchdog.start()
+    try:
+        for line in proc.stdout:
+            output_tail.append(line)
+            line = line.strip()
+            if line.startswith('http') and any(host in line for host in hosts):
+                seen.setdefault(line, None)
+                if playlist_end is not None and len(seen) >= playlist_end:
+                    proc.terminate()
+                    stopped_early = True
+                    break
+        proc.wait()
+    finally:
+        watchdog.cancel()
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout, output='\n'.join(seen))
+    if proc.returncode != 0 and not stopped_early:
+        raise subprocess.CalledProcessError(
+            proc.returncode, cmd, output='\n'.join(seen), stderr=''.join(output_tail)
+        )
+    return list(seen)
+
+
+# All the link shapes TikTok uses for video posts, as one comma-joined
+# selector so the page is queried (and waited on) once instead of per-shape
+_TIKTOK_LINK_SELECTOR = 'a[href*="/video/"], [data-e2e="user-post-item"] a, a[href*="video"]'
+
+
+# Resource types the URL scraper never reads; aborting them cuts most of a
+# TikTok page's bandwidth and lets the DOM become interactive much sooner
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+
+
+def _block_heavy_resources(route):
+    """Sync route handler: abort media-type requests, pass the rest."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+async def _block_heavy_resources_async(route):
+    """Async route handler: abort media-type requests, pass the rest."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# Cap on simultaneous browser contexts: each Chromium context costs real
+# memory, and an unbounded batch can OOM the machine long before the network
+# saturates. TikTok scrape throughput saturates at this limit.
+_MAX_CONTEXTS = int(os.getenv('PW_MAX_CONTEXTS', '4'))
+_ctx_sem = threading.Semaphore(_MAX_CONTEXTS)
+
+
+# Shared sync Playwright browser: launching Chromium costs ~1s cold, which
+# dwarfs the actual scrape, so keep one browser per process and open a fresh
+# (cheap, isolated) context per scrape instead of relaunching every call
+_sync_pw = None
+_sync_browser = None
+_sync_browser_lock = threading.Lock()
+
+
+def _shutdown_sync_browser() -> None:
+    """Close the shared sync browser and stop Playwright at interpreter exit."""
+    global _sync_pw, _sync_browser
+    if _sync_browser is not None:
+        with contextlib.suppress(Exception):
+            _sync_browser.close()
+        _sync_browser = None
+    if _sync_pw is not None:
+        with contextlib.suppress(Exception):
+            _sync_pw.stop()
+        _sync_pw = None
+
+
+def _get_sync_browser():
+    """Return the shared headless Chromium, launching it on first use."""
+    global _sync_pw, _sync_browser
+    if sync_playwright is None:
+        raise ImportError(
+            "Playwright is required for TikTok scraping. Install with: pip install playwright && playwright install"
+        )
+    with _sync_browser_lock:
+        if _sync_pw is None:
+            _sync_pw = sync_playwright().start()
+            atexit.register(_shutdown_sync_browser)
+        if _sync_browser is None or not _sync_browser.is_connected():
+            _sync_browser = _sync_pw.chromium.launch(headless=True)
+    return _sync_browser
+
+
+# Known YouTube hosts; classifying on the parsed netloc is one hash lookup
+# instead of four regex searches per URL, and rejects lookalike domains
+_YT_HOSTS = ("youtube.com", "youtu.be", "www.youtu.be")
 
 
 def is_tiktok_url(url: str) -> bool:
     """Check if URL is a TikTok URL."""
-    return "tiktok.com" in url.lower()
+    netloc = urlparse(url).netloc.lower()
+    return netloc == "tiktok.com" or netloc.endswith(".tiktok.com")
 
 
 def is_youtube_url(url: str) -> bool:
     """Check if URL is a YouTube URL."""
-    youtube_patterns = [
-        r'youtube\.com',
-        r'youtu\.be',
-        r'youtube\.com/watch',
-        r'youtube\.com/shorts'
-    ]
-    return any(re.search(pattern, url.lower()) for pattern in youtube_patterns)
+    netloc = urlparse(url).netloc.lower()
+    return netloc in _YT_HOSTS or netloc.endswith(".youtube.com")
+
+
+def _scrape_tiktok_via_ytdlp(url: str) -> Optional[List[str]]:
+    """
+    Try to list a TikTok profile's video URLs with yt-dlp.
+
+    Returns:
+        Deduplicated list of video URLs, or None if yt-dlp is unavailable
+        or produced nothing (callers fall back to Playwright)
+    """
+    # Preferred path: yt-dlp as a library. extract_info in-process skips the
+    # interpreter fork and stdout parsing the CLI path below pays per call.
+    if YoutubeDL is not None:
+        try:
+            video_urls = [
+                u for u in _flat_entry_urls(url, None) if 'tiktok.com' in u
+            ]
+        except Exception:
+            return None  # Fall back to Playwright
+        if video_urls:
+            # Remove duplicates, preserving order
+            return list(dict.fromkeys(video_urls))
+        return None
+
+    # CLI fallback when the yt_dlp module isn't importable
+    try:
+        yt_dlp_cmd = _resolve_ytdlp()
+
+        if yt_dlp_cmd:
+            # Use yt-dlp to get video URLs from TikTok channel, streaming
+            # its output instead of buffering the whole listing
+            cmd = [
+                yt_dlp_cmd,
+                "--flat-playlist",
+                "--print", "url",
+                "--no-warnings",
+                url
+            ]
+            unique_urls = _stream_cli_urls(cmd, ('tiktok.com',))
+            if unique_urls:
+                return unique_urls
+    except Exception:
+        pass  # Fall back to Playwright
+
+    return None
 
 
 def scrape_tiktok_videos(url: str) -> List[str]:
@@ -52,122 +307,164 @@ def scrape_tiktok_videos(url: str) -> List[str]:
     
     # For user profiles, we need to scrape using Playwright
     # Try multiple approaches: Playwright scraping or yt-dlp
-    
+
     # First, try using yt-dlp to get video URLs (more reliable)
+    unique_urls = _scrape_tiktok_via_ytdlp(url)
+    if unique_urls:
+        return unique_urls
+
+    # Fallback to Playwright scraping: fresh context on the shared browser,
+    # gated so at most _MAX_CONTEXTS contexts are alive at once
+    browser = _get_sync_browser()
+    _ctx_sem.acquire()
+    try:
+        context = browser.new_context()
+    except BaseException:
+        _ctx_sem.release()
+        raise
     try:
-        import subprocess
-        yt_dlp_cmd = None
+        context.route("**/*", _block_heavy_resources)
+        page = context.new_page()
+
+        # 'commit' returns as soon as navigation starts; the selector wait
+        # below is the real readiness signal, so fast pages don't idle in a
+        # fixed sleep and slow ones get the full selector timeout
+        page.goto(url, wait_until="commit", timeout=30000)
+
+        # One wait for any video-link shape, then one DOM read for all of
+        # them: worst-case selector wait drops from 3x5s to 10s, and the
+        # evaluate is a single CDP round-trip. Just map hrefs in the browser
+        # (.href is absolute); filtering and dedup happen in Python where
+        # they're O(n) hashing instead of JS-side list scans
         try:
-            subprocess.run(["yt-dlp", "--version"], capture_output=True, check=True)
-            yt_dlp_cmd = "yt-dlp"
-        except:
-            try:
-                subprocess.run(["python3", "-m", "yt_dlp", "--version"], capture_output=True, check=True)
-                yt_dlp_cmd = ["python3", "-m", "yt_dlp"]
-            except:
-                pass
-        
-        if yt_dlp_cmd:
-            # Use yt-dlp to get video URLs from TikTok channel
-            cmd = [yt_dlp_cmd] if isinstance(yt_dlp_cmd, str) else yt_dlp_cmd
-            cmd.extend([
-                "--flat-playlist",
-                "--print", "url",
-                "--no-warnings",
-                url
-            ])
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            
-            if result.returncode == 0:
-                video_urls = []
-                for line in result.stdout.strip().split('\n'):
-                    line = line.strip()
-                    if line and line.startswith('http') and 'tiktok.com' in line:
-                        video_urls.append(line)
-                
-                if video_urls:
-                    # Remove duplicates
-                    seen = set()
-                    unique_urls = []
-                    for url_item in video_urls:
-                        if url_item not in seen:
-                            seen.add(url_item)
-                            unique_urls.append(url_item)
-                    return unique_urls
-    except Exception:
-        pass  # Fall back to Playwright
-    
-    # Fallback to Playwright scraping
+            page.wait_for_selector(_TIKTOK_LINK_SELECTOR, timeout=10000)
+        except PlaywrightTimeoutError:
+            return []
+        hrefs = page.evaluate(f"""
+            () => Array.from(document.querySelectorAll('{_TIKTOK_LINK_SELECTOR}')).map(link => link.href)
+        """)
+        video_urls = [
+            href for href in (hrefs or []) if href and '/video/' in href
+        ]
+
+        # Remove duplicates, preserving order
+        return list(dict.fromkeys(video_urls))
+
+    except PlaywrightTimeoutError:
+        raise ConnectionError(f"Timeout loading TikTok page: {url}")
+    except Exception as e:
+        raise ConnectionError(f"Failed to scrape TikTok: {e}")
+    finally:
+        context.close()
+        _ctx_sem.release()
+
+
+@contextlib.asynccontextmanager
+async def _browser_pool():
+    """
+    Launch one headless Chromium and share it across scrapes.
+
+    Chromium cold start costs several hundred ms and a lot of RAM, so
+    scraping K profiles through one browser (a fresh context per URL)
+    amortizes the launch instead of paying it K times.
+    """
+    if async_playwright is None:
+        raise ImportError(
+            "Playwright is required for TikTok scraping. Install with: pip install playwright && playwright install"
+        )
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            yield browser
+        finally:
+            await browser.close()
+
+
+async def scrape_tiktok_videos_async(url: str, browser) -> List[str]:
+    """
+    Async variant of scrape_tiktok_videos using a shared browser.
+
+    Args:
+        url: TikTok page URL (single video or user profile)
+        browser: Async Playwright browser from _browser_pool()
+
+    Returns:
+        List of video URLs
+
+    Raises:
+        ValueError: If URL is not a valid TikTok URL
+        ConnectionError: If network request fails
+    """
+    if not is_tiktok_url(url):
+        raise ValueError(f"Invalid TikTok URL: {url}")
+
+    # If it's already a single video URL, return it
+    if '/video/' in url:
+        return [url]
+
+    # yt-dlp first (more reliable); runs in a thread so other scrapes proceed
+    unique_urls = await asyncio.to_thread(_scrape_tiktok_via_ytdlp, url)
+    if unique_urls:
+        return unique_urls
+
+    # Fallback to Playwright scraping: isolated context, shared browser
+    context = await browser.new_context()
     try:
-        from playwright.sync_api import sync_playwright
-        
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            
-            try:
-                # Increase timeout and wait for page to load
-                page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                
-                # Wait a bit for dynamic content to load
-                page.wait_for_timeout(3000)
-                
-                # Try multiple selectors for video links
-                selectors = [
-                    'a[href*="/video/"]',
-                    '[data-e2e="user-post-item"] a',
-                    'a[href*="video"]'
-                ]
-                
-                video_urls = []
-                for selector in selectors:
-                    try:
-                        page.wait_for_selector(selector, timeout=5000)
-                        # Extract all video URLs
-                        urls = page.evaluate(f"""
-                            () => {{
-                                const links = Array.from(document.querySelectorAll('{selector}'));
-                                return links.map(link => {{
-                                    const href = link.getAttribute('href');
-                                    return href ? (href.startsWith('http') ? href : 'https://www.tiktok.com' + href) : null;
-                                }}).filter(url => url && url.includes('/video/'));
-                            }}
-                        """)
-                        video_urls.extend(urls if urls else [])
-                        if video_urls:
-                            break
-                    except:
-                        continue
-                
-                browser.close()
-                
-                # Remove duplicates and return
-                seen = set()
-                unique_urls = []
-                for url_item in video_urls:
-                    if url_item and url_item not in seen:
-                        seen.add(url_item)
-                        unique_urls.append(url_item)
-                
-                return unique_urls if unique_urls else []
-                
-            except PlaywrightTimeoutError:
-                browser.close()
-                raise ConnectionError(f"Timeout loading TikTok page: {url}")
-            except Exception as e:
-                browser.close()
-                raise ConnectionError(f"Failed to scrape TikTok: {e}")
-                
-    except ImportError:
-        raise ImportError("Playwright is required for TikTok scraping. Install with: pip install playwright && playwright install")
+        await context.route("**/*", _block_heavy_resources_async)
+        page = await context.new_page()
+        # Selector wait below is the readiness signal; no fixed sleep
+        await page.goto(url, wait_until="commit", timeout=30000)
+
+        # One wait for any video-link shape, then one DOM read for all of
+        # them; map hrefs in the browser, filter and dedupe in Python
+        try:
+            await page.wait_for_selector(_TIKTOK_LINK_SELECTOR, timeout=10000)
+        except Exception:
+            return []
+        hrefs = await page.evaluate(f"""
+            () => Array.from(document.querySelectorAll('{_TIKTOK_LINK_SELECTOR}')).map(link => link.href)
+        """)
+        video_urls = [
+            href for href in (hrefs or []) if href and '/video/' in href
+        ]
+
+        # Remove duplicates, preserving order
+        return list(dict.fromkeys(video_urls))
     except Exception as e:
-        raise ConnectionError(f"Failed to scrape TikTok videos: {e}")
+        raise ConnectionError(f"Failed to scrape TikTok: {e}")
+    finally:
+        await context.close()
+
+
+async def _scrape_many_async(urls: List[str]) -> List[List[str]]:
+    """Scrape many TikTok pages concurrently through one shared browser."""
+    # Same context cap as the sync path, but as an asyncio semaphore bound
+    # to this event loop
+    semaphore = asyncio.Semaphore(_MAX_CONTEXTS)
+
+    async def one(url: str) -> List[str]:
+        async with semaphore:
+            return await scrape_tiktok_videos_async(url, browser)
+
+    async with _browser_pool() as browser:
+        return await asyncio.gather(*(one(url) for url in urls))
+
+
+def scrape_tiktok_videos_many(urls: List[str]) -> List[List[str]]:
+    """
+    Scrape multiple TikTok pages with one browser launch.
+
+    Concurrent page loads overlap the network/selector waits that dominate
+    scrape time, so K profiles take roughly one launch + the slowest load
+    instead of K x (launch + load).
+
+    Args:
+        urls: TikTok page URLs
+
+    Returns:
+        One list of video URLs per input URL, in order
+    """
+    return asyncio.run(_scrape_many_async(urls))
 
 
 def scrape_youtube_videos(
@@ -199,21 +496,6 @@ def scrape_youtube_videos(
     if '/watch' in url or '/shorts/' in url:
         return [url]
     
-    # For channels or playlists, use yt-dlp to get video URLs
-    # Check if yt-dlp is available
-    yt_dlp_cmd = None
-    try:
-        subprocess.run(["yt-dlp", "--version"], capture_output=True, check=True)
-        yt_dlp_cmd = "yt-dlp"
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        try:
-            subprocess.run(["python3", "-m", "yt_dlp", "--version"], capture_output=True, check=True)
-            yt_dlp_cmd = ["python3", "-m", "yt_dlp"]
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            raise FileNotFoundError(
-                "yt-dlp is not installed. Install it with: pip install yt-dlp"
-            )
-    
     # Determine playlist end parameter
     if max_videos is None or (isinstance(max_videos, str) and max_videos.lower() == "all"):
         playlist_end = None  # No limit
@@ -224,59 +506,65 @@ def scrape_youtube_videos(
             f"Invalid max_videos value: {max_videos}. "
             f"Must be a positive integer or 'all'"
         )
-    
+
+    # For channels or playlists, use yt-dlp to get video URLs.
+    # Preferred path: the yt_dlp library in-process (no subprocess fork, no
+    # version probe — a cached YoutubeDL reuses its HTTP session per limit)
+    if YoutubeDL is not None:
+        try:
+            video_urls = [
+                u for u in _flat_entry_urls(url, playlist_end)
+                if 'youtube.com' in u or 'youtu.be' in u
+            ]
+        except Exception as e:
+            error_msg = str(e)
+            # Check for common errors
+            if "Private video" in error_msg or "Video unavailable" in error_msg:
+                raise ValueError(f"Some videos are unavailable or private: {url}")
+            elif "This video is not available" in error_msg:
+                raise ValueError(f"Video/channel not available: {url}")
+            else:
+                raise RuntimeError(f"Failed to scrape YouTube videos: {error_msg}")
+
+        # Remove duplicates while preserving order; playlistend (with
+        # lazy_playlist) already enforces the limit, so no post-slice
+        return list(dict.fromkeys(video_urls))
+
+    # CLI fallback when the yt_dlp module isn't importable
+    yt_dlp_cmd = _resolve_ytdlp()
+    if yt_dlp_cmd is None:
+        raise FileNotFoundError(
+            "yt-dlp is not installed. Install it with: pip install yt-dlp"
+        )
+
     try:
         # Build yt-dlp command to extract video URLs
         # --flat-playlist: Don't download, just list videos
         # --get-url: Get video URLs
         # --playlist-end: Limit number of videos
-        cmd = [yt_dlp_cmd] if isinstance(yt_dlp_cmd, str) else yt_dlp_cmd
-        cmd.extend([
+        cmd = [
+            yt_dlp_cmd,
             "--flat-playlist",
             "--print", "url",  # Print video URLs
             "--no-warnings",
             "--no-playlist-reverse",  # Get latest videos first
-        ])
-        
+        ]
+
         # Add playlist end limit if specified
         if playlist_end is not None:
             cmd.extend(["--playlist-end", str(playlist_end)])
-        
+
         # Add the URL
         cmd.append(url)
-        
-        # Run yt-dlp
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=60  # 60 second timeout
+
+        # Stream yt-dlp's output: URLs are deduplicated as they arrive and
+        # the process is stopped once playlist_end unique URLs are in, so
+        # memory stays flat even for max_videos='all' on large channels
+        return _stream_cli_urls(
+            cmd, ('youtube.com', 'youtu.be'), playlist_end=playlist_end
         )
-        
-        # Parse output - each line is a video URL
-        video_urls = []
-        for line in result.stdout.strip().split('\n'):
-            line = line.strip()
-            if line and line.startswith('http'):
-                # Ensure it's a full YouTube URL
-                if 'youtube.com' in line or 'youtu.be' in line:
-                    video_urls.append(line)
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_urls = []
-        for url_item in video_urls:
-            if url_item not in seen:
-                seen.add(url_item)
-                unique_urls.append(url_item)
-        
-        # Apply limit if specified (yt-dlp may return more than requested)
-        if playlist_end is not None and len(unique_urls) > playlist_end:
-            unique_urls = unique_urls[:playlist_end]
-        
-        return unique_urls
-        
+
+
     except subprocess.TimeoutExpired:
         raise RuntimeError(f"Timeout while scraping YouTube videos from: {url}")
     except subprocess.CalledProcessError as e:
@@ -293,13 +581,48 @@ def scrape_youtube_videos(
         raise RuntimeError(f"Failed to scrape YouTube videos: {e}")
 
 
+# Host-to-scraper dispatch table (www./m. prefixes stripped before lookup)
+_HOST_HANDLERS = {
+    'tiktok.com': scrape_tiktok_videos,
+    'youtube.com': scrape_youtube_videos,
+    'youtu.be': scrape_youtube_videos,
+}
+
+
+def _handler_for_host(host: str):
+    """Resolve the scraper for a lowercased netloc, or None if unsupported."""
+    host = host.removeprefix('www.').removeprefix('m.')
+    handler = _HOST_HANDLERS.get(host)
+    if handler is None and host.endswith('.tiktok.com'):
+        handler = scrape_tiktok_videos  # short-link hosts like vm./vt.
+    if handler is None and host.endswith('.youtube.com'):
+        handler = scrape_youtube_videos  # subdomains like music./gaming.
+    return handler
+
+
+# Recent scrape results keyed by (url, max_videos): reruns of the same
+# channel during interactive iteration return from memory instead of
+# re-hitting the network. Entries expire after SCRAPE_CACHE_TTL seconds
+# (default 10 minutes) so daily-refresh users still pick up new videos.
+_SCRAPE_CACHE_TTL = float(os.getenv('SCRAPE_CACHE_TTL', '600'))
+_SCRAPE_CACHE_MAX = 256
+_scrape_cache = {}  # (url, max_videos) -> (expires_at, urls)
+_scrape_cache_lock = threading.Lock()
+
+
+def clear_scrape_cache() -> None:
+    """Drop all memoized scrape results (force fresh scrapes)."""
+    with _scrape_cache_lock:
+        _scrape_cache.clear()
+
+
 def scrape_videos(
     url: str,
     max_videos: Optional[Union[int, str]] = 10
 ) -> List[str]:
     """
     Scrape video URLs from TikTok or YouTube.
-    
+
     Args:
         url: TikTok or YouTube URL
         max_videos: Maximum number of videos to scrape (YouTube channels/playlists only).
@@ -307,20 +630,93 @@ def scrape_videos(
                    Use int for specific limit (e.g., 50)
                    Use "all" or None to get all videos (no limit)
                    Note: For TikTok, this parameter is ignored (always returns all found)
-        
+
     Returns:
-        List of video URLs
-        
+        List of video URLs (cached for up to _SCRAPE_CACHE_TTL seconds;
+        call clear_scrape_cache() to force a fresh scrape)
+
     Raises:
         ValueError: If URL is not from a supported platform
     """
-    if is_tiktok_url(url):
-        return scrape_tiktok_videos(url)
-    elif is_youtube_url(url):
-        return scrape_youtube_videos(url, max_videos=max_videos)
-    else:
+    # One netloc parse + dict lookup instead of re-checking the URL per
+    # platform; matters mostly when dispatching inside scrape_videos_batch
+    handler = _handler_for_host(urlparse(url).netloc.lower())
+    if handler is None:
         raise ValueError(f"Unsupported URL: {url}. Must be from TikTok or YouTube.")
 
+    key = (url, max_videos)
+    now = time.monotonic()
+    with _scrape_cache_lock:
+        cached = _scrape_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return list(cached[1])
+
+    if handler is scrape_youtube_videos:
+        result = handler(url, max_videos=max_videos)
+    else:
+        result = handler(url)
+
+    with _scrape_cache_lock:
+        if len(_scrape_cache) >= _SCRAPE_CACHE_MAX:
+            # Drop expired entries first, then the oldest if still full
+            for stale_key in [k for k, v in _scrape_cache.items() if v[0] <= now]:
+                del _scrape_cache[stale_key]
+            while len(_scrape_cache) >= _SCRAPE_CACHE_MAX:
+                del _scrape_cache[next(iter(_scrape_cache))]
+        _scrape_cache[key] = (now + _SCRAPE_CACHE_TTL, list(result))
+    return result
+
+
+def scrape_videos_batch(
+    urls: List[str],
+    max_videos: Optional[Union[int, str]] = 10,
+    max_workers: int = 16
+) -> Dict[str, Union[List[str], Exception]]:
+    """
+    Scrape multiple pages concurrently.
+
+    The scrapes are network-bound, so overlapping them drops wall time by
+    roughly min(N, max_workers)x. To stay polite, calls against the same
+    host are serialized (a per-host lock), so TikTok and YouTube pages run
+    in parallel but we never hammer one site from several threads at once.
+
+    Args:
+        urls: TikTok and/or YouTube URLs
+        max_videos: Per-URL limit, as in scrape_videos
+        max_workers: Maximum simultaneous scrapes
+
+    Returns:
+        Dictionary mapping each input URL to its list of video URLs, or to
+        the exception raised while scraping it
+    """
+    # Parse each URL's netloc exactly once; it serves as both the politeness
+    # lock key and the dispatch key, so workers never re-parse or re-lower
+    # the full URL
+    url_hosts = {url: urlparse(url).netloc.lower() for url in urls}
+    host_locks: Dict[str, threading.Semaphore] = {
+        host: threading.Semaphore(1) for host in set(url_hosts.values())
+    }
+
+    def one(url: str) -> List[str]:
+        host = url_hosts[url]
+        handler = _handler_for_host(host)
+        if handler is None:
+            raise ValueError(f"Unsupported URL: {url}. Must be from TikTok or YouTube.")
+        with host_locks[host]:
+            if handler is scrape_youtube_videos:
+                return handler(url, max_videos=max_videos)
+            return handler(url)
+
+    results: Dict[str, Union[List[str], Exception]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {url: executor.submit(one, url) for url in urls}
+        for url, future in futures.items():
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                results[url] = e
+    return results
+
 
 if __name__ == "__main__":
     # TODO: Add main execution logic
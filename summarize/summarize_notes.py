@@ -1,8 +1,11 @@
 """
 Summarize transcripts into markdown study notes using OpenAI GPT.
 """
+import asyncio
+import functools
+import json
 import os
-from typing import Optional
+from typing import Dict, List, Optional, Union
 
 # Load environment variables from .env file if it exists
 try:
@@ -12,32 +15,98 @@ except ImportError:
     pass  # python-dotenv not installed, use system env vars only
 
 try:
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
+    from openai import AuthenticationError, BadRequestError, RateLimitError
 except ImportError:
     OpenAI = None
+    AsyncOpenAI = None
+    AuthenticationError = BadRequestError = RateLimitError = None
 
 
-PROMPT_TEMPLATE = """Convert the following transcript into well-structured markdown study notes.
+@functools.lru_cache(maxsize=1)
+def _api_key() -> str:
+    """Read OPENAI_API_KEY once; batches of summaries reuse the cached value."""
+    key = os.getenv("OPENAI_API_KEY")
+    return key.strip() if key else ""
 
-Transcript:
-{transcript}
 
-Please format the output as:
-- Clear headings and subheadings
-- Key points as bullet lists
-- Important concepts highlighted
-- Summary section at the end
+# Shared OpenAI client: reusing one client keeps the pooled HTTP connection
+# (and its TLS session) alive across transcripts instead of paying a fresh
+# handshake per call
+_CLIENT = None
 
-Make the notes concise but comprehensive, focusing on the main topics and key takeaways."""
+
+def _get_client() -> "OpenAI":
+    """Return the module-wide OpenAI client, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = OpenAI(api_key=_api_key())
+    return _CLIENT
+
+
+_ASYNC_CLIENT = None
+
+
+def _get_async_client() -> "AsyncOpenAI":
+    """Return the module-wide AsyncOpenAI client, creating it on first use."""
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is None:
+        _ASYNC_CLIENT = AsyncOpenAI(api_key=_api_key())
+    return _ASYNC_CLIENT
+
+
+def _raise_api_error(e: Exception, model: str):
+    """Map an OpenAI API failure onto the module's exception conventions."""
+    # Dispatch on the SDK's exception types where we can: faster than the
+    # substring ladder and immune to message-wording drift
+    if RateLimitError is not None and isinstance(e, RateLimitError):
+        if "insufficient_quota" in str(e).lower():
+            raise RuntimeError("OpenAI API quota exceeded. Please check your account.")
+        raise RuntimeError("OpenAI API rate limit exceeded. Please try again later.")
+    if AuthenticationError is not None and isinstance(e, AuthenticationError):
+        raise ValueError("Invalid OpenAI API key. Please check your API key.")
+    if BadRequestError is not None and isinstance(e, BadRequestError):
+        error_msg = str(e)
+        if "context_length" in error_msg.lower() or "token" in error_msg.lower():
+            raise ValueError(
+                f"Transcript too long for model {model}. "
+                f"Consider using a model with larger context window or chunking the transcript."
+            )
+        raise RuntimeError(f"Summarization failed: {error_msg}")
+
+    # Fallback for non-SDK exceptions (e.g. transport errors)
+    error_msg = str(e)
+
+    if "rate_limit" in error_msg.lower() or "429" in error_msg:
+        raise RuntimeError("OpenAI API rate limit exceeded. Please try again later.")
+    elif "invalid_api_key" in error_msg.lower() or "401" in error_msg:
+        raise ValueError("Invalid OpenAI API key. Please check your API key.")
+    elif "insufficient_quota" in error_msg.lower():
+        raise RuntimeError("OpenAI API quota exceeded. Please check your account.")
+    elif "context_length" in error_msg.lower() or "token" in error_msg.lower():
+        raise ValueError(
+            f"Transcript too long for model {model}. "
+            f"Consider using a model with larger context window or chunking the transcript."
+        )
+    else:
+        raise RuntimeError(f"Summarization failed: {error_msg}")
+
+
+# All formatting instructions live in the system message (a stable prefix
+# that provider-side prompt caching can reuse); the user message is just the
+# transcript, so short transcripts don't pay instruction overhead twice
+SYSTEM_PROMPT = (
+    "You are a helpful assistant that converts transcripts into well-structured "
+    "markdown study notes. Format the output with clear headings and subheadings, "
+    "key points as bullet lists, important concepts highlighted, and a summary "
+    "section at the end. Make the notes concise but comprehensive, focusing on "
+    "the main topics and key takeaways."
+)
 
 
 def check_openai_available() -> bool:
     """Check if OpenAI library is installed and API key is available."""
-    if OpenAI is None:
-        return False
-    
-    api_key = os.getenv("OPENAI_API_KEY")
-    return api_key is not None and api_key.strip() != ""
+    return OpenAI is not None and bool(_api_key())
 
 
 def summarize_transcript(
@@ -76,12 +145,9 @@ def summarize_transcript(
     if not transcript or not transcript.strip():
         raise ValueError("Transcript is empty. Cannot generate notes from empty transcript.")
     
-    # Initialize OpenAI client
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    
-    # Format prompt with transcript
-    prompt = PROMPT_TEMPLATE.format(transcript=transcript)
-    
+    # Shared OpenAI client (connection pool reused across calls)
+    client = _get_client()
+
     try:
         # Call OpenAI API
         response = client.chat.completions.create(
@@ -89,11 +155,11 @@ def summarize_transcript(
             messages=[
                 {
                     "role": "system",
-                    "content": "You are a helpful assistant that converts transcripts into well-structured markdown study notes."
+                    "content": SYSTEM_PROMPT
                 },
                 {
                     "role": "user",
-                    "content": prompt
+                    "content": transcript
                 }
             ],
             temperature=temperature,
@@ -102,26 +168,182 @@ def summarize_transcript(
         
         # Extract markdown notes from response
         notes = response.choices[0].message.content.strip()
-        
+
         return notes
-        
+
     except Exception as e:
-        error_msg = str(e)
-        
-        # Handle common errors
-        if "rate_limit" in error_msg.lower() or "429" in error_msg:
-            raise RuntimeError("OpenAI API rate limit exceeded. Please try again later.")
-        elif "invalid_api_key" in error_msg.lower() or "401" in error_msg:
-            raise ValueError("Invalid OpenAI API key. Please check your API key.")
-        elif "insufficient_quota" in error_msg.lower():
-            raise RuntimeError("OpenAI API quota exceeded. Please check your account.")
-        elif "context_length" in error_msg.lower() or "token" in error_msg.lower():
-            raise ValueError(
-                f"Transcript too long for model {model}. "
-                f"Consider using a model with larger context window or chunking the transcript."
-            )
-        else:
-            raise RuntimeError(f"Summarization failed: {error_msg}")
+        _raise_api_error(e, model)
+
+
+def summarize_with_title(
+    transcript: str,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.3
+) -> Dict[str, str]:
+    """
+    Generate study notes and a title in a single OpenAI call.
+
+    Fusing the two requests saves a full network round-trip per video and
+    avoids sending the transcript prefix twice.
+
+    Args:
+        transcript: Raw transcript text
+        model: OpenAI model to use
+        temperature: Sampling temperature (0.0-2.0). Lower = more focused.
+
+    Returns:
+        Dictionary with 'title' (3-8 words) and 'notes' (markdown)
+
+    Raises:
+        ValueError: If transcript is empty or OpenAI API key not set
+        ImportError: If OpenAI library is not installed
+        RuntimeError: If the call fails or returns unparseable JSON
+    """
+    # Check if OpenAI is available
+    if OpenAI is None:
+        raise ImportError(
+            "OpenAI library is not installed. Install it with: pip install openai"
+        )
+
+    if not check_openai_available():
+        raise ValueError(
+            "OpenAI API key is not set. Set it with: export OPENAI_API_KEY='your-key'"
+        )
+
+    # Validate transcript
+    if not transcript or not transcript.strip():
+        raise ValueError("Transcript is empty. Cannot generate notes from empty transcript.")
+
+    # Shared OpenAI client (connection pool reused across calls)
+    client = _get_client()
+
+    try:
+        # One call returns both title and notes as JSON
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        SYSTEM_PROMPT +
+                        " Return a JSON object with keys 'title' (a concise 3-8 word "
+                        "title, no quotes) and 'notes' (the markdown study notes)."
+                    )
+                },
+                {
+                    "role": "user",
+                    "content": transcript
+                }
+            ],
+            temperature=temperature,
+            max_tokens=2000,
+            response_format={"type": "json_object"}
+        )
+
+        payload = json.loads(response.choices[0].message.content)
+        title = str(payload["title"]).strip()
+        notes = str(payload["notes"]).strip()
+        if not title or not notes:
+            raise KeyError("title/notes missing or empty")
+        return {"title": title, "notes": notes}
+
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        # Callers fall back to the separate summarize + title calls
+        raise RuntimeError(f"Combined summarization returned unusable JSON: {e}")
+    except Exception as e:
+        _raise_api_error(e, model)
+
+
+async def summarize_transcript_async(
+    transcript: str,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.3
+) -> str:
+    """
+    Async variant of summarize_transcript for concurrent batch drivers.
+
+    Args:
+        transcript: Raw transcript text
+        model: OpenAI model to use
+        temperature: Sampling temperature (0.0-2.0). Lower = more focused.
+
+    Returns:
+        Formatted markdown notes
+
+    Raises:
+        Same exceptions as summarize_transcript
+    """
+    # Check if OpenAI is available
+    if AsyncOpenAI is None:
+        raise ImportError(
+            "OpenAI library is not installed. Install it with: pip install openai"
+        )
+
+    if not check_openai_available():
+        raise ValueError(
+            "OpenAI API key is not set. Set it with: export OPENAI_API_KEY='your-key'"
+        )
+
+    # Validate transcript
+    if not transcript or not transcript.strip():
+        raise ValueError("Transcript is empty. Cannot generate notes from empty transcript.")
+
+    client = _get_async_client()
+
+    try:
+        response = await client.chat.completions.create(
+            model=model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": transcript
+                }
+            ],
+            temperature=temperature,
+            max_tokens=2000
+        )
+        return response.choices[0].message.content.strip()
+    except Exception as e:
+        _raise_api_error(e, model)
+
+
+async def _summarize_all(transcripts: List[str], model: str, concurrency: int) -> List[Union[str, BaseException]]:
+    """Summarize many transcripts concurrently, gated by a semaphore."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(transcript: str) -> str:
+        async with semaphore:
+            return await summarize_transcript_async(transcript, model=model)
+
+    return await asyncio.gather(*(one(t) for t in transcripts), return_exceptions=True)
+
+
+def summarize_all(
+    transcripts: List[str],
+    model: str = "gpt-4o-mini",
+    concurrency: int = 10
+) -> List[Union[str, BaseException]]:
+    """
+    Summarize multiple transcripts with overlapped OpenAI calls.
+
+    The calls are network-bound, so issuing them concurrently (bounded to
+    stay inside RPM/TPM quotas) drops the LLM stage from a sum of latencies
+    toward the latency of the slowest call.
+
+    Args:
+        transcripts: Raw transcript texts
+        model: OpenAI model to use
+        concurrency: Maximum simultaneous API calls
+
+    Returns:
+        List with one entry per transcript, in order: the markdown notes on
+        success, or the exception raised for that transcript
+    """
+    return asyncio.run(_summarize_all(transcripts, model, concurrency))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+"""
+Shared pytest fixtures for the test suite.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Repo root on sys.path, computed once for the whole session (test modules
+# rely on conftest being imported first instead of repeating this shim)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-integration", action="store_true", default=False,
+        help="Run integration- and performance-marked tests (skipped by default)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Keep the default inner-loop run fast: network/API-bound tests are
+    skipped unless --run-integration is passed."""
+    if config.getoption("--run-integration"):
+        return
+    skip_slow = pytest.mark.skip(reason="needs --run-integration")
+    for item in items:
+        if "integration" in item.keywords or "performance" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope="session")
+def mkbhd_videos():
+    """
+    Full @mkbhd channel listing, scraped once per session.
+
+    The channel-scrape tests slice this instead of each re-invoking yt-dlp
+    against the same channel.
+    """
+    from scrape.scrape_videos import scrape_youtube_videos
+    try:
+        return scrape_youtube_videos("https://www.youtube.com/@mkbhd", max_videos="all")
+    except (RuntimeError, ValueError, FileNotFoundError) as e:
+        # May fail due to network, yt-dlp issues, or channel restrictions
+        pytest.skip(f"Channel scraping failed (may be network/API issue): {e}")
+
+
+@pytest.fixture(scope="session")
+def extracted_audios(youtube_shorts_mp4, tiktok_mp4, tmp_path_factory):
+    """
+    Both test audios, extracted once per session.
+
+    extract_audio_batch runs a single multi-input ffmpeg invocation, so the
+    two extraction tests share one process spawn instead of paying
+    spawn + codec init each.
+    """
+    from audio.extract_audio import check_ffmpeg_installed, extract_audio_batch
+    if not check_ffmpeg_installed():
+        pytest.skip("FFmpeg not installed")
+    out_dir = tmp_path_factory.mktemp("audio")
+    results = extract_audio_batch([
+        (str(youtube_shorts_mp4), str(out_dir / "youtube_shorts_audio.wav")),
+        (str(tiktok_mp4), str(out_dir / "tiktok_audio.wav")),
+    ])
+    return {"youtube_shorts": results[0], "tiktok": results[1]}
+
+
+@pytest.fixture(scope="session")
+def summaries_cache():
+    """
+    Session-wide transcript -> notes memo.
+
+    Tests that exercise the real summarization API share this dict so a
+    given transcript costs at most one round-trip per session.
+    """
+    return {}
+
+
+def _test_media(name: str) -> Path:
+    """Resolve a test media file, skipping the dependent test if absent."""
+    path = Path("test_downloads") / name
+    if not path.exists():
+        pytest.skip(f"Test video not found: {path}")
+    return path
+
+
+@pytest.fixture(scope="session")
+def youtube_shorts_mp4() -> Path:
+    """Downloaded YouTube Shorts sample, resolved once per session."""
+    return _test_media("youtube_shorts_test.mp4")
+
+
+@pytest.fixture(scope="session")
+def tiktok_mp4() -> Path:
+    """Downloaded TikTok sample, resolved once per session."""
+    return _test_media("tiktok_test.mp4")
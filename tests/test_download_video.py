@@ -2,18 +2,15 @@
 Tests for download_video module.
 """
 import pytest
-import sys
 from pathlib import Path
 
-# Add parent directory to path to import modules
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from download.download_video import (
     download_video,
     is_tiktok_url,
     is_youtube_url,
     validate_url,
-    get_video_info
+    get_video_info,
+    _default_output_path
 )
 
 
@@ -88,6 +85,27 @@ class TestDownloadVideo:
         # assert video_path == output_path or Path(output_path).exists()
         # pytest.skip("Requires yt-dlp installation")
 
+    @pytest.mark.unit
+    @pytest.mark.high
+    def test_prefetch_paths_match_pipeline_download_paths(self, tmp_path):
+        """Prefetch writes to the exact paths the pipeline later checks.
+
+        download_videos(output_dir=...) must produce {videos_dir}/{id}.mp4
+        with the same video id run_pipeline's _download_step derives, or
+        the prefetch cache is never hit and every video downloads twice."""
+        from run_pipeline import _TIKTOK_VID_RE, _YT_ID_RE
+
+        videos_dir = str(tmp_path)
+        urls = [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://www.youtube.com/shorts/AbCdEfGhIjK",
+            "https://www.tiktok.com/@user/video/7443874677115718942",
+        ]
+        for url in urls:
+            match = _YT_ID_RE.search(url) or _TIKTOK_VID_RE.search(url)
+            pipeline_path = str(Path(videos_dir) / f"{match.group(1)}.mp4")
+            assert _default_output_path(url, videos_dir) == pipeline_path
+
     @pytest.mark.unit
     @pytest.mark.medium
     def test_get_video_info_tiktok(self):
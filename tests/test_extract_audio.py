@@ -1,14 +1,22 @@
 """
 Tests for extract_audio module.
 """
+import os
+
 import pytest
-import sys
-from pathlib import Path
 
-# Add parent directory to path to import modules
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from audio.extract_audio import extract_audio, extract_audio_batch, check_ffmpeg_installed
+
+
+def _assert_nonempty(path):
+    """Assert a file exists and is non-empty with a single stat call."""
+    assert os.stat(path).st_size > 0
 
-from audio.extract_audio import extract_audio, check_ffmpeg_installed
+# Evaluated once at import (the probe itself is lru_cached); marked tests are
+# skipped at collection instead of paying setup + in-body guard per test
+requires_ffmpeg = pytest.mark.skipif(
+    not check_ffmpeg_installed(), reason="FFmpeg not installed"
+)
 
 
 class TestExtractAudio:
@@ -16,33 +24,18 @@ class TestExtractAudio:
 
     @pytest.mark.unit
     @pytest.mark.high
-    def test_2_1_valid_mp4_video_file(self):
+    @requires_ffmpeg
+    def test_2_1_valid_mp4_video_file(self, extracted_audios):
         """Test Case 2.1: Valid MP4 Video File"""
-        # Skip if FFmpeg not installed
-        if not check_ffmpeg_installed():
-            pytest.skip("FFmpeg not installed")
-        
-        # Use real downloaded video if available
-        video_path = "test_downloads/youtube_shorts_test.mp4"
-        if not Path(video_path).exists():
-            pytest.skip(f"Test video not found: {video_path}")
-        
-        output_path = "test_downloads/output_audio.wav"
-        result = extract_audio(video_path, output_path)
-        
-        # Verify output
-        assert result == output_path
-        assert Path(output_path).exists()
-        assert Path(output_path).stat().st_size > 0
+        # Extraction happens once per session (one batched ffmpeg call
+        # shared with test_2_6); this asserts on the produced output
+        _assert_nonempty(extracted_audios["youtube_shorts"])
 
     @pytest.mark.unit
     @pytest.mark.high
+    @requires_ffmpeg
     def test_2_2_nonexistent_video_file(self):
         """Test Case 2.2: Non-existent Video File"""
-        # Skip if FFmpeg not installed
-        if not check_ffmpeg_installed():
-            pytest.skip("FFmpeg not installed")
-        
         video_path = "test_data/nonexistent.mp4"
         output_path = "test_data/output_audio.wav"
         # Expected: FileNotFoundError
@@ -81,24 +74,27 @@ class TestExtractAudio:
 
     @pytest.mark.unit
     @pytest.mark.high
-    def test_2_6_verify_wav_format_specifications(self):
+    @requires_ffmpeg
+    def test_2_6_verify_wav_format_specifications(self, extracted_audios):
         """Test Case 2.6: Verify WAV Format Specifications"""
-        # Skip if FFmpeg not installed
-        if not check_ffmpeg_installed():
-            pytest.skip("FFmpeg not installed")
-        
-        # Use real downloaded video if available
-        video_path = "test_downloads/tiktok_test.mp4"
-        if not Path(video_path).exists():
-            pytest.skip(f"Test video not found: {video_path}")
-        
-        output_path = "test_downloads/tiktok_audio.wav"
-        result = extract_audio(video_path, output_path)
-        
         # Verify output file exists and has content
-        assert Path(result).exists()
-        assert Path(result).stat().st_size > 0
+        _assert_nonempty(extracted_audios["tiktok"])
         
         # Note: Full format verification would require audio analysis library
         # For now, we verify the file exists and has content
 
+    @pytest.mark.unit
+    @pytest.mark.medium
+    def test_2_7_batch_extract_empty_list(self):
+        """Test Case 2.7: Batch Extraction With Empty List"""
+        assert extract_audio_batch([]) == []
+
+    @pytest.mark.unit
+    @pytest.mark.medium
+    @requires_ffmpeg
+    def test_2_8_batch_extract_nonexistent_video(self):
+        """Test Case 2.8: Batch Extraction With Non-existent Video"""
+        pairs = [("test_data/nonexistent.mp4", "test_data/output_audio.wav")]
+        with pytest.raises(FileNotFoundError):
+            extract_audio_batch(pairs)
+
@@ -2,11 +2,6 @@
 Integration tests for full pipeline.
 """
 import pytest
-import sys
-from pathlib import Path
-
-# Add parent directory to path to import modules
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 
 class TestIntegration:
@@ -0,0 +1,47 @@
+"""
+Tests for process_channel module.
+"""
+import pytest
+import re
+
+from process_channel import sanitize_channel_name
+
+
+class TestProcessChannel:
+    """Test suite for process_channel module."""
+
+    @pytest.mark.unit
+    @pytest.mark.medium
+    def test_sanitize_channel_name_matches_legacy_sanitizer(self):
+        """Sanitizer is equivalent to the old 4-pass version.
+
+        Channel directory names are persisted on disk, so the slug must not
+        drift: a divergence orphans existing state files and notes dirs."""
+        channel_names = [
+            "preddy_ml",
+            "raneshguruparan",
+            "Mr Beast",
+            "Some Channel!",
+            "channel-with-hyphens",
+            "study.notes",
+            "Mr. Beast",
+            "  padded name  ",
+            "dots.and spaces.mixed",
+        ]
+        for name in channel_names:
+            legacy = re.sub(r'[^\w\s-]', '', name).strip().replace(' ', '_').lower()
+            assert sanitize_channel_name(name) == legacy
+
+    @pytest.mark.unit
+    @pytest.mark.medium
+    def test_sanitize_channel_name_punctuation_deleted(self):
+        """Embedded punctuation is deleted, exactly as the legacy slug did."""
+        assert sanitize_channel_name("study.notes") == "studynotes"
+
+    @pytest.mark.unit
+    @pytest.mark.medium
+    def test_sanitize_channel_name_empty(self):
+        """Missing or fully-stripped names fall back to unknown_channel."""
+        assert sanitize_channel_name(None) == "unknown_channel"
+        assert sanitize_channel_name("") == "unknown_channel"
+        assert sanitize_channel_name("!!!") == "unknown_channel"
@@ -2,12 +2,8 @@
 Tests for transcribe module.
 """
 import pytest
-import sys
 from pathlib import Path
 
-# Add parent directory to path to import modules
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from transcript.transcribe import transcribe_audio, check_openai_available
 
 
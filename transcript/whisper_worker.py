@@ -0,0 +1,128 @@
+"""
+Long-lived transcription worker that keeps the Whisper model resident.
+
+Loading Whisper weights costs seconds per process; a driver that invokes the
+pipeline in a loop of short-lived interpreters pays that on every video. The
+worker process loads the model once and then serves transcription requests
+over a pair of queues, so N videos share one model load (and, on GPU, one
+CUDA context).
+"""
+import atexit
+import multiprocessing
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+
+def _worker_main(q_in, q_out, language, model_size):
+    """Worker loop: load the model on first request, serve until None."""
+    # The spawned child may not inherit the repo root on sys.path
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from transcript.transcribe import transcribe_audio
+
+    while True:
+        audio_path = q_in.get()
+        if audio_path is None:
+            break
+        try:
+            # transcribe_audio caches the loaded model within this process,
+            # so every request after the first reuses the resident weights
+            transcript = transcribe_audio(audio_path, language=language, model_size=model_size)
+            q_out.put(("ok", transcript))
+        except Exception as e:
+            q_out.put(("error", f"{type(e).__name__}: {e}"))
+
+
+class WhisperWorker:
+    """
+    Handle to a persistent transcription worker process.
+
+    Requests are serial (one model, one GPU); callers send a path and block
+    for the transcript. Use shutdown() when the batch completes.
+    """
+
+    def __init__(self, language: Optional[str] = None, model_size: str = "base"):
+        """
+        Args:
+            language: Optional language code passed to every transcription
+            model_size: Whisper model size loaded by the worker
+        """
+        ctx = multiprocessing.get_context("spawn")
+        self._q_in = ctx.Queue()
+        self._q_out = ctx.Queue()
+        self._process = ctx.Process(
+            target=_worker_main,
+            args=(self._q_in, self._q_out, language, model_size),
+            daemon=True
+        )
+        self._process.start()
+
+    def transcribe(self, audio_path: str) -> str:
+        """
+        Transcribe one audio file in the worker process.
+
+        Args:
+            audio_path: Path to audio file
+
+        Returns:
+            Transcribed text
+
+        Raises:
+            RuntimeError: If the worker is stopped or transcription failed
+        """
+        if not self._process.is_alive():
+            raise RuntimeError("Whisper worker is not running")
+        self._q_in.put(str(audio_path))
+        status, payload = self._q_out.get()
+        if status == "error":
+            raise RuntimeError(f"Worker transcription failed: {payload}")
+        return payload
+
+    def transcribe_batch(self, audio_paths: List[str]) -> List[Optional[str]]:
+        """
+        Transcribe many audio files against the one resident model.
+
+        Args:
+            audio_paths: Paths to audio files
+
+        Returns:
+            List of transcripts in input order (None for files that failed)
+        """
+        results = []
+        for audio_path in audio_paths:
+            try:
+                results.append(self.transcribe(audio_path))
+            except RuntimeError as e:
+                print(f"⚠️  {e}")
+                results.append(None)
+        return results
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the worker process (sends the sentinel, then terminates)."""
+        if self._process.is_alive():
+            self._q_in.put(None)
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join(timeout)
+
+
+# Module-level worker shared by callers that don't manage their own
+_WORKER: Optional[WhisperWorker] = None
+
+
+def get_worker(language: Optional[str] = None, model_size: str = "base") -> WhisperWorker:
+    """Return the shared worker, spawning it on first use."""
+    global _WORKER
+    if _WORKER is None or not _WORKER._process.is_alive():
+        _WORKER = WhisperWorker(language=language, model_size=model_size)
+        atexit.register(shutdown_worker)
+    return _WORKER
+
+
+def shutdown_worker() -> None:
+    """Stop the shared worker if it is running."""
+    global _WORKER
+    if _WORKER is not None:
+        _WORKER.shutdown()
+        _WORKER = None
@@ -3,13 +3,46 @@ Processing state management for tracking processed videos and resuming from last
 """
 import json
 import os
+import re
+import time
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Optional, List, Tuple
 
+try:
+    import orjson  # C-extension JSON; ~5-10x faster on large state dicts
+except ImportError:
+    orjson = None
+
+# Parse with orjson when available (both accept str and bytes)
+_json_loads = json.loads if orjson is None else orjson.loads
+
 
 STATE_FILE = ".processing_state.json"
 
+# Append-only delta log beside the snapshot: per-video updates are O(1)
+# appends instead of O(total history) snapshot rewrites. Snapshots fold the
+# log back in (compaction), so the log stays short.
+STATE_LOG_FILE = ".processing_state.jsonl"
+
+# Candidate video IDs embedded in note filenames: TikTok numeric IDs or
+# YouTube 11-character IDs
+_FILENAME_ID_RE = re.compile(r'\d{6,}|[0-9A-Za-z_-]{11}')
+
+# URL id patterns, compiled once instead of per extract_video_id call
+_TIKTOK_ID_RE = re.compile(r'/video/(\d+)')
+_YOUTUBE_ID_RE = re.compile(r'(?:v=|/)([0-9A-Za-z_-]{11})')
+
+# Directories already created this run; saves a mkdir syscall per state write
+_dirs_ensured = set()
+
+
+def _ensure_dir(channel_dir: Path) -> None:
+    """Create channel_dir once per run instead of on every state write."""
+    if channel_dir not in _dirs_ensured:
+        channel_dir.mkdir(parents=True, exist_ok=True)
+        _dirs_ensured.add(channel_dir)
+
 
 def load_processing_state(channel_dir: Path) -> Optional[Dict]:
     """
@@ -26,13 +59,27 @@ def load_processing_state(channel_dir: Path) -> Optional[Dict]:
         return None
     
     try:
-        with open(state_file, 'r', encoding='utf-8') as f:
-            state = json.load(f)
-        return state
-    except (json.JSONDecodeError, IOError) as e:
+        state = _json_loads(state_file.read_bytes())
+        # Inflate the processed-IDs list back into a set for O(1) membership
+        state["processed_ids"] = set(state.get("processed_ids", state.get("processed_videos", {})))
+    except (ValueError, IOError) as e:
         print(f"⚠️  Warning: Failed to load processing state: {e}")
         return None
 
+    # Replay deltas appended since the last snapshot (corrupt lines — e.g. a
+    # torn final write — are skipped; replay is idempotent)
+    log_file = channel_dir / STATE_LOG_FILE
+    try:
+        with open(log_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    _apply_delta(state, _json_loads(line))
+                except (ValueError, TypeError, KeyError):
+                    continue
+    except IOError:
+        pass  # No log: the snapshot is already current
+    return state
+
 
 def save_processing_state(channel_dir: Path, state: Dict) -> bool:
     """
@@ -50,14 +97,31 @@ def save_processing_state(channel_dir: Path, state: Dict) -> bool:
     
     try:
         # Ensure directory exists
-        channel_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Write to temp file first (atomic write)
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            json.dump(state, f, indent=2, ensure_ascii=False)
-        
-        # Atomic rename
-        temp_file.replace(state_file)
+        _ensure_dir(channel_dir)
+
+        # Serialize the processed-IDs set as a sorted list (JSON-safe).
+        # Compact form: indent=2 is 2-3x the bytes for a file only the
+        # tooling reads (use dump_pretty for human inspection)
+        to_dump = dict(state)
+        to_dump["processed_ids"] = sorted(state.get("processed_ids", ()))
+        if orjson is not None:
+            data = orjson.dumps(to_dump)
+        else:
+            data = json.dumps(to_dump, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+        # Write to temp file and fsync before the rename so the replacement
+        # is atomic and durable even across a crash
+        with open(temp_file, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, state_file)
+
+        # The snapshot now contains everything in the delta log: truncate it
+        # (compaction) so load-time replay stays short
+        log_file = channel_dir / STATE_LOG_FILE
+        if log_file.exists():
+            log_file.unlink()
         return True
     except IOError as e:
         print(f"⚠️  Warning: Failed to save processing state: {e}")
@@ -66,6 +130,129 @@ def save_processing_state(channel_dir: Path, state: Dict) -> bool:
         return False
 
 
+def dump_pretty(state: Dict) -> str:
+    """
+    Pretty-printed JSON view of a state dict, for human inspection only
+    (snapshots on disk are compact).
+    """
+    to_dump = dict(state)
+    to_dump["processed_ids"] = sorted(state.get("processed_ids", ()))
+    return json.dumps(to_dump, indent=2, ensure_ascii=False)
+
+
+class StateSaver:
+    """
+    Batches processing-state writes with a dirty flag and periodic flushes.
+
+    Rewriting the full (growing) state JSON after every video is O(N^2) bytes
+    written over a channel run; flushing every few updates or seconds keeps
+    resume granularity without the write amplification. Callers should force
+    a final flush (and register it via atexit) so no updates are lost on exit.
+    """
+
+    def __init__(self, flush_every: int = 10, flush_interval: float = 30.0):
+        """
+        Args:
+            flush_every: Flush after this many updates
+            flush_interval: Flush if this many seconds passed since last flush
+        """
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._dirty = False
+        self._updates_since_flush = 0
+        self._last_flush = time.monotonic()
+
+    def mark_dirty(self):
+        """Record that the in-memory state has unsaved changes."""
+        self._dirty = True
+        self._updates_since_flush += 1
+
+    def maybe_flush(self, channel_dir: Path, state: Dict, force: bool = False) -> bool:
+        """
+        Write the state to disk if due (or forced) and there are unsaved changes.
+
+        Args:
+            channel_dir: Channel output directory
+            state: State dictionary to save
+            force: Flush regardless of the update/time thresholds
+
+        Returns:
+            True if the state was written, False otherwise
+        """
+        if not self._dirty:
+            return False
+
+        due = (
+            force
+            or self._updates_since_flush >= self.flush_every
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+        if not due:
+            return False
+
+        if save_processing_state(channel_dir, state):
+            self._dirty = False
+            self._updates_since_flush = 0
+            self._last_flush = time.monotonic()
+            return True
+        return False
+
+
+def append_state_delta(channel_dir: Path, delta: Dict) -> bool:
+    """
+    Append one per-video delta record to the JSONL log (O(1) per update).
+
+    Args:
+        channel_dir: Channel output directory
+        delta: Delta record as produced by update_processing_state
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        _ensure_dir(channel_dir)
+        with open(channel_dir / STATE_LOG_FILE, 'a', encoding='utf-8') as f:
+            if orjson is not None:
+                f.write(orjson.dumps(delta).decode("utf-8") + "\n")
+            else:
+                f.write(json.dumps(delta, ensure_ascii=False) + "\n")
+        return True
+    except IOError as e:
+        print(f"⚠️  Warning: Failed to append state delta: {e}")
+        return False
+
+
+def _apply_delta(state: Dict, delta: Dict) -> None:
+    """
+    Fold one delta record into a state dict (idempotent: re-applying the
+    same record, e.g. when a log survives a snapshot crash, is a no-op).
+    """
+    video_id = delta["video_id"]
+    status = delta.get("status", "success")
+
+    # Move (not blindly bump) the per-status counters so replays and
+    # reprocessed videos don't double-count
+    counters = {"success": "total_processed", "failed": "total_failed", "skipped": "total_skipped"}
+    previous = state.setdefault("processed_videos", {}).get(video_id)
+    if previous is not None and previous.get("status") in counters:
+        key = counters[previous["status"]]
+        state[key] = max(0, state.get(key, 0) - 1)
+    if status in counters:
+        key = counters[status]
+        state[key] = state.get(key, 0) + 1
+
+    state["processed_videos"][video_id] = {
+        "url": delta.get("url"),
+        "video_id": video_id,
+        "notes_file": delta.get("notes_file"),
+        "processed_at": delta.get("processed_at"),
+        "status": status
+    }
+    state.setdefault("processed_ids", set()).add(video_id)
+    state["last_processed_url"] = delta.get("url")
+    state["last_updated"] = delta.get("processed_at")
+
+
 def create_initial_state(channel_url: str, channel_name: str) -> Dict:
     """
     Create initial processing state structure.
@@ -84,25 +271,55 @@ def create_initial_state(channel_url: str, channel_name: str) -> Dict:
         "last_processed_index": -1,
         "last_updated": None,
         "processed_videos": {},
+        "processed_ids": set(),
         "total_processed": 0,
         "total_skipped": 0,
         "total_failed": 0
     }
 
 
+def build_notes_index(notes_dir: Path) -> Dict[str, str]:
+    """
+    Scan the notes directory once and index note filenames by video ID.
+
+    Replaces a per-video `notes_dir.glob(f"*{video_id}*")` scan (O(videos x
+    files)) with a single directory listing and O(1) lookups.
+
+    Args:
+        notes_dir: Directory containing notes files
+
+    Returns:
+        Dictionary mapping candidate video IDs to note filenames
+    """
+    index = {}
+    if not notes_dir.exists():
+        return index
+
+    # os.scandir avoids the extra stat call per entry that iterdir incurs
+    with os.scandir(notes_dir) as entries:
+        for entry in entries:
+            for match in _FILENAME_ID_RE.finditer(entry.name):
+                index[match.group(0)] = entry.name
+    return index
+
+
 def is_video_processed(
     video_id: str,
     state: Optional[Dict],
-    notes_dir: Path
+    notes_dir: Path,
+    notes_index: Optional[Dict[str, str]] = None
 ) -> Tuple[bool, Optional[str]]:
     """
     Check if a video has already been processed.
-    
+
     Args:
         video_id: Video ID to check
         state: Processing state dictionary (can be None)
         notes_dir: Directory containing notes files
-        
+        notes_index: Optional precomputed index from build_notes_index().
+                    When provided, the filename fallback is an O(1) lookup
+                    instead of a directory glob.
+
     Returns:
         Tuple of (is_processed, notes_filename or None)
     """
@@ -122,34 +339,37 @@ def is_video_processed(
                     return False, None
     
     # Method 2: Fallback to filename pattern search
+    if notes_index is not None:
+        notes_filename = notes_index.get(video_id)
+        if notes_filename:
+            return True, notes_filename
+        return False, None
+
     existing_notes = list(notes_dir.glob(f"*{video_id}*"))
     if existing_notes:
         return True, existing_notes[0].name
-    
+
     return False, None
 
 
 def find_resume_index(video_urls: List[str], last_processed_url: Optional[str]) -> int:
     """
     Find the index to resume from in the video list.
-    
+
     Args:
         video_urls: List of video URLs
         last_processed_url: Last processed video URL from state
-        
+
     Returns:
         Index to start from (0 if not found or None)
     """
     if not last_processed_url:
         return 0
-    
-    try:
-        last_index = video_urls.index(last_processed_url)
-        # Resume from next video after last processed
-        return last_index + 1
-    except ValueError:
-        # Last processed URL not in current list (maybe order changed or new scrape)
-        return 0
+
+    # O(1) lookup; -1 (not found: order changed or new scrape) maps to 0,
+    # otherwise resume from the video after the last processed one
+    url_index = {url: i for i, url in enumerate(video_urls)}
+    return url_index.get(last_processed_url, -1) + 1
 
 
 def update_processing_state(
@@ -157,43 +377,39 @@ def update_processing_state(
     video_id: str,
     video_url: str,
     notes_file: Optional[str],
-    status: str = "success"
+    status: str = "success",
+    channel_dir: Optional[Path] = None
 ) -> Dict:
     """
     Update processing state after processing a video.
-    
+
+    The update is expressed as a single delta record, folded into the
+    in-memory dict and (when channel_dir is given) appended to the JSONL
+    log — an O(1) write per video instead of rewriting the whole snapshot.
+
     Args:
         state: Current state dictionary
         video_id: Video ID
         video_url: Video URL
         notes_file: Notes filename (None if failed)
         status: Processing status ("success", "failed", "skipped")
-        
+        channel_dir: Channel output directory; when provided, the delta is
+                    persisted to the append-only log immediately
+
     Returns:
         Updated state dictionary
     """
-    # Update processed videos dict
-    state["processed_videos"][video_id] = {
-        "url": video_url,
+    delta = {
         "video_id": video_id,
+        "url": video_url,
         "notes_file": notes_file,
         "processed_at": datetime.now().isoformat(),
         "status": status
     }
-    
-    # Update last processed URL and index
-    # Note: index will be updated by caller who knows the position
-    state["last_processed_url"] = video_url
-    state["last_updated"] = datetime.now().isoformat()
-    
-    # Update totals
-    if status == "success":
-        state["total_processed"] = state.get("total_processed", 0) + 1
-    elif status == "failed":
-        state["total_failed"] = state.get("total_failed", 0) + 1
-    elif status == "skipped":
-        state["total_skipped"] = state.get("total_skipped", 0) + 1
-    
+    _apply_delta(state, delta)
+    # Note: last_processed_index will be updated by caller who knows the position
+    if channel_dir is not None:
+        append_state_delta(channel_dir, delta)
     return state
 
 
@@ -207,13 +423,11 @@ def extract_video_id(video_url: str) -> Optional[str]:
     Returns:
         Video ID or None
     """
-    import re
-    
     if "tiktok.com" in video_url:
-        match = re.search(r'/video/(\d+)', video_url)
+        match = _TIKTOK_ID_RE.search(video_url)
         return match.group(1) if match else None
     elif "youtube.com" in video_url or "youtu.be" in video_url:
-        match = re.search(r'(?:v=|\/)([0-9A-Za-z_-]{11}).*', video_url)
+        match = _YOUTUBE_ID_RE.search(video_url)
         return match.group(1) if match else None
     return None
 